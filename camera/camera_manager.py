@@ -256,6 +256,17 @@ class CameraManager:
             return self.ir_camera.get_frame()
         return None
     
+    def get_frame_ir_gray(self):
+        """Get the IR camera's full-resolution luma plane, or None when no such stream is configured"""
+        if not self.ir_camera or not self._running:
+            return None
+        
+        # The lores stream may be scaled down for motion detection; only a full-size plane will do here
+        luma = self.ir_camera.get_luma_frame()
+        if luma is not None and (luma.shape[1], luma.shape[0]) == tuple(self.ir_camera.resolution):
+            return luma
+        return None
+    
     def get_frame_hq(self):
         """Get current frame from HQ camera"""
         if self.hq_camera and self._running:
@@ -274,15 +285,21 @@ class CameraManager:
             return self.hq_camera.reset_roi()
         return False
     
-    def capture_still_hq(self, filepath: str, high_quality: bool = True) -> bool:
+    def capture_still_hq(self, filepath: str, high_quality: bool = True,
+                         resolution: Optional[Tuple[int, int]] = None) -> bool:
         """Capture a still image from HQ camera outside of preview stream"""
         if self.hq_camera and self._running:
+            if resolution:
+                return self.hq_camera.capture_still(filepath, high_quality, resolution)
             return self.hq_camera.capture_still(filepath, high_quality)
         return False
 
-    def capture_still_ir(self, filepath: str, high_quality: bool = True) -> bool:
+    def capture_still_ir(self, filepath: str, high_quality: bool = True,
+                         resolution: Optional[Tuple[int, int]] = None) -> bool:
         """Capture a still image from IR camera outside of preview stream"""
         if self.ir_camera and self._running:
+            if resolution:
+                return self.ir_camera.capture_still(filepath, high_quality, resolution)
             return self.ir_camera.capture_still(filepath, high_quality)
         return False
 
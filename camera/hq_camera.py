@@ -4,6 +4,7 @@ Handles the HQ camera for detailed zoom captures
 """
 
 import logging
+import queue
 import threading
 import time
 import cv2
@@ -17,6 +18,18 @@ from config.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Manual exposure mode controls (AeConstraintMode 3 = Manual)
+_AE_OFF = {"AeEnable": False, "AeConstraintMode": 3}
+
+# _applied cache key -> libcamera control name
+_CONTROL_KEYS = (('exposure', 'ExposureTime'), ('gain', 'AnalogueGain'),
+                 ('brightness', 'Brightness'), ('contrast', 'Contrast'))
+
+# Day/night manual presets, applied together with _AE_OFF in a single set_controls call
+# Day: 3ms minimal exposure; night: 40ms with less gain than the IR camera
+_DAY_PRESET = {"ExposureTime": 3000, "AnalogueGain": 1.0, "Brightness": 0.0, "Contrast": 0.9}
+_NIGHT_PRESET = {"ExposureTime": 40000, "AnalogueGain": 6.0, "Brightness": 0.1, "Contrast": 1.1}
+
 class HQCamera:
     """High-quality camera handler for detailed captures"""
     
@@ -31,9 +44,13 @@ class HQCamera:
         self._lock = threading.Lock()
         self._active = False
         self._streaming = False
-        self._capture_thread: Optional[threading.Thread] = None
+        self._encode_thread: Optional[threading.Thread] = None
+        # Single-slot drop-oldest handoff so JPEG encoding never stalls capture
+        self._out_queue: queue.Queue = queue.Queue(maxsize=1)
         self._latest_frame: Optional[np.ndarray] = None
         self._is_auto_exposure = Config.CAMERA_SETTINGS['hq_camera']['auto_exposure']
+        # Last values sent via set_controls, used to skip no-op control updates
+        self._applied = {'exposure': None, 'gain': None, 'brightness': None, 'contrast': None}
         
         # ROI (Region of Interest) for zooming
         self._roi_active = False
@@ -65,23 +82,28 @@ class HQCamera:
             else:
                 controls["AeEnable"] = True
             
-            # Configure for both streaming (lores) and still capture (main)
-            # For HQ camera (IMX477): max resolution 4056x3040, streaming at configured resolution
-            max_resolution = (4056, 3040)  # IMX477 max resolution
+            # Single main stream at streaming resolution - no continuous lores scaler pass
+            # Full-sensor (4056x3040) stills reconfigure on demand in capture_still(high_quality=True)
             config = self._camera.create_video_configuration(
-                main={"format": "RGB888", "size": max_resolution},  # High-res for still capture
-                lores={"format": "RGB888", "size": self.resolution},  # Lower res for streaming
+                main={"format": "RGB888", "size": self.resolution},
                 controls=controls,
                 # Apply 180-degree rotation for upside-down camera mounting
                 transform=Transform(hflip=1, vflip=1)
             )
             
             self._camera.configure(config)
+            # Frames are delivered by Picamera2's own thread through post_callback
+            self._camera.post_callback = self._on_frame
             self._camera.start()
             
             # Initialize streaming output
             self._streaming_output = StreamingOutput()
             
+            # The hardware MJPEG encoder would stream the uncropped main stream, losing the ROI zoom
+            if Config.CAMERA_SETTINGS['hq_camera'].get('encode_on_gpu') or Config.STREAMING.get('encode_on_gpu', False):
+                logger.warning("encode_on_gpu is not supported for the HQ camera (ROI zoom is applied in software), "
+                               "using software JPEG encoding")
+            
             self._active = True
             logger.info(f"HQ camera {self.camera_index} initialized successfully")
             
@@ -105,9 +127,9 @@ class HQCamera:
                 # Set streaming flag BEFORE starting thread to avoid race condition
                 self._streaming = True
                 
-                # Start capture thread
-                self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
-                self._capture_thread.start()
+                # Frames arrive via post_callback; start the encoder thread that feeds the stream
+                self._encode_thread = threading.Thread(target=self._encode_loop, daemon=True)
+                self._encode_thread.start()
                 
                 logger.info("HQ camera streaming started")
                 return True
@@ -125,44 +147,70 @@ class HQCamera:
             
             self._streaming = False
             
-            if self._capture_thread and self._capture_thread.is_alive():
-                self._capture_thread.join(timeout=5.0)
+            if self._encode_thread and self._encode_thread.is_alive():
+                self._encode_thread.join(timeout=5.0)
             
             logger.info("HQ camera streaming stopped")
     
-    def _capture_loop(self):
-        """Main capture loop for streaming"""
-        logger.info("HQ camera capture loop started")
+    def _on_frame(self, request):
+        """Picamera2 post_callback: publish each completed frame while streaming"""
+        if not self._streaming or not self._active:
+            return
+        
+        # Stills captured through switch_mode_and_capture_file also pass through here at full sensor size
+        if tuple(request.config["main"]["size"]) != tuple(self.resolution):
+            return
+        
+        try:
+            # Frame is in RGB format from Picamera2
+            frame = request.make_array("main")
+            
+            # Apply ROI if active
+            if self._roi_active and self._roi_coords:
+                frame = self._apply_roi(frame)
+            
+            # Cache the latest frame for get_frame() calls
+            with self._lock:
+                self._latest_frame = frame
+            
+            # Hand off to the encoder thread, replacing any frame it hasn't taken yet
+            self._publish_frame(frame)
+            
+        except Exception as e:
+            logger.error(f"Error in HQ camera frame callback: {e}")
+    
+    def _publish_frame(self, frame: np.ndarray):
+        """Queue a frame for encoding, dropping the oldest one if the encoder is behind"""
+        try:
+            self._out_queue.put_nowait(frame)
+        except queue.Full:
+            try:
+                self._out_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._out_queue.put_nowait(frame)
+    
+    def _encode_loop(self):
+        """Encoder loop feeding queued frames to the streaming output"""
+        logger.info("HQ camera encode loop started")
         
         while self._streaming and self._active:
             try:
-                # Capture frame from lores stream for streaming
-                frame = self._camera.capture_array("lores")
-                
-                if frame is not None:
-                    # Frame is in RGB format from Picamera2
-                    # Apply ROI if active
-                    if self._roi_active and self._roi_coords:
-                        frame = self._apply_roi(frame)
-                    
-                    # Cache the latest frame for get_frame() calls
-                    with self._lock:
-                        self._latest_frame = frame.copy()
-                    
-                    # Pass to streaming output which will handle conversion for JPEG encoding
-                    if self._streaming_output:
-                        self._streaming_output.write_frame(frame)
-                
-                # Dynamic frame timing - don't force fixed FPS
-                # The camera will naturally pace based on exposure time
-                # Just prevent CPU spinning with minimal sleep
-                time.sleep(0.001)  # 1ms minimal sleep
-                
+                frame = self._out_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            try:
+                # Frame is in RGB format from Picamera2
+                # Pass to streaming output which will handle conversion for JPEG encoding
+                if self._streaming_output:
+                    self._streaming_output.write_frame(frame)
+                else:
+                    logger.warning("No streaming output available for HQ camera")
             except Exception as e:
-                logger.error(f"Error in HQ camera capture loop: {e}")
-                time.sleep(0.1)
+                logger.error(f"Error in HQ camera encode loop: {e}")
         
-        logger.info("HQ camera capture loop ended")
+        logger.info("HQ camera encode loop ended")
     
     def _apply_roi(self, frame: np.ndarray) -> np.ndarray:
         """Apply region of interest (crop and zoom)"""
@@ -209,6 +257,10 @@ class HQCamera:
         
         return None
     
+    def get_encoded_frame(self) -> Optional[memoryview]:
+        """Get the latest hardware-encoded JPEG; always None, the HQ stream is encoded in software"""
+        return None
+    
     def get_stream(self):
         """Get the streaming generator for Flask"""
         if self._streaming_output:
@@ -252,6 +304,8 @@ class HQCamera:
     def set_exposure(self, exposure_time: int):
         """Set exposure time in microseconds"""
         if self._camera and self._active:
+            if not self._is_auto_exposure and self._is_applied('exposure', exposure_time):
+                return True
             try:
                 # Only switch to manual mode if we're currently in auto mode
                 if self._is_auto_exposure:
@@ -269,6 +323,7 @@ class HQCamera:
                 self._camera.set_controls({
                     "ExposureTime": exposure_time
                 })
+                self._applied['exposure'] = exposure_time
                 
                 logger.info(f"HQ camera exposure set to {exposure_time}μs")
                 return True
@@ -279,6 +334,8 @@ class HQCamera:
     def set_gain(self, gain: float):
         """Set analogue gain"""
         if self._camera and self._active:
+            if not self._is_auto_exposure and self._is_applied('gain', gain):
+                return True
             try:
                 # Only switch to manual mode if we're currently in auto mode
                 if self._is_auto_exposure:
@@ -296,12 +353,18 @@ class HQCamera:
                 self._camera.set_controls({
                     "AnalogueGain": gain
                 })
+                self._applied['gain'] = gain
                 logger.info(f"HQ camera gain set to {gain}")
                 return True
             except Exception as e:
                 logger.error(f"Failed to set HQ camera gain: {e}")
         return False
     
+    def _is_applied(self, key: str, value: float) -> bool:
+        """Check whether a control value matches the last one applied"""
+        applied = self._applied[key]
+        return applied is not None and abs(applied - value) < 1e-3
+    
     def is_active(self) -> bool:
         """Check if camera is active"""
         return self._active
@@ -345,7 +408,7 @@ class HQCamera:
     
     def get_auto_exposure(self) -> bool:
         """Get auto exposure status"""
-        return Config.CAMERA_SETTINGS['hq_camera']['auto_exposure']
+        return self._is_auto_exposure
     
     def set_auto_exposure(self, enabled: bool) -> bool:
         """Enable or disable auto exposure"""
@@ -361,38 +424,18 @@ class HQCamera:
                     })
                     self._is_auto_exposure = True
                     Config.CAMERA_SETTINGS['hq_camera']['auto_exposure'] = True
+                    # AE now drives exposure and gain, so cached manual values are stale
+                    self._applied['exposure'] = self._applied['gain'] = None
                     logger.info("HQ camera auto exposure enabled")
                 elif not enabled and self._is_auto_exposure:
                     # Switch to manual mode with day/night defaults
                     import datetime
                     current_hour = datetime.datetime.now().hour
-                    
-                    if 6 <= current_hour <= 20:  # Daytime (6 AM to 8 PM)
-                        exposure_time = 3000   # 3ms - minimal for daytime HQ
-                        gain = 1.0            # Minimal gain
-                        brightness = 0.0      # No brightness boost
-                        contrast = 0.9        # Slightly reduced contrast for day
-                        logger.info("HQ camera switching to manual mode with daytime defaults")
-                    else:  # Nighttime
-                        exposure_time = 40000  # 40ms - longer for night
-                        gain = 6.0            # Higher gain for night (less than IR)
-                        brightness = 0.1      # Slight brightness boost
-                        contrast = 1.1        # Higher contrast for night
-                        logger.info("HQ camera switching to manual mode with nighttime defaults")
+                    daytime = 6 <= current_hour <= 20  # Daytime (6 AM to 8 PM)
+                    logger.info(f"HQ camera switching to manual mode with {'daytime' if daytime else 'nighttime'} defaults")
                     
                     # Switch to manual mode WITHOUT frame duration limits
-                    self._camera.set_controls({
-                        "AeEnable": False,
-                        "AeConstraintMode": 3,  # Manual mode
-                        "ExposureTime": exposure_time,
-                        "AnalogueGain": gain,
-                        "Brightness": brightness,
-                        "Contrast": contrast
-                        # NO FrameDurationLimits - this interferes with manual settings
-                    })
-                    self._is_auto_exposure = False
-                    Config.CAMERA_SETTINGS['hq_camera']['auto_exposure'] = False
-                    logger.info(f"HQ camera manual mode: exposure={exposure_time}μs, gain={gain}, brightness={brightness}, contrast={contrast}")
+                    self._apply_manual_preset(_DAY_PRESET if daytime else _NIGHT_PRESET)
                 else:
                     # Already in the requested mode
                     logger.debug(f"HQ camera already in {'auto' if enabled else 'manual'} exposure mode")
@@ -407,7 +450,10 @@ class HQCamera:
             try:
                 # Clamp brightness to valid range
                 brightness = max(-1.0, min(1.0, brightness))
+                if self._is_applied('brightness', brightness):
+                    return True
                 self._camera.set_controls({"Brightness": brightness})
+                self._applied['brightness'] = brightness
                 logger.info(f"HQ camera brightness set to {brightness}")
                 return True
             except Exception as e:
@@ -430,7 +476,10 @@ class HQCamera:
             try:
                 # Clamp contrast to valid range
                 contrast = max(0.0, min(2.0, contrast))
+                if self._is_applied('contrast', contrast):
+                    return True
                 self._camera.set_controls({"Contrast": contrast})
+                self._applied['contrast'] = contrast
                 logger.info(f"HQ camera contrast set to {contrast}")
                 return True
             except Exception as e:
@@ -443,32 +492,20 @@ class HQCamera:
             if not self._camera:
                 return {'error': 'Camera not initialized'}
             
-            # Get current controls from camera
-            controls = self._camera.camera_controls
-            
-            # Extract current values from controls (they return tuples with min,max,default)
-            exposure_time = 33000
-            gain = 4.0
-            brightness = 0.0
-            contrast = 1.0
-            
             try:
-                # Get actual current values using capture_metadata
+                # Single capture_metadata call provides all current values
                 metadata = self._camera.capture_metadata()
-                exposure_time = int(metadata.get('ExposureTime', 33000))
-                gain = float(metadata.get('AnalogueGain', 4.0))
-                brightness = float(metadata.get('Brightness', 0.0)) 
-                contrast = float(metadata.get('Contrast', 1.0))
             except Exception as e:
                 logger.debug(f"Could not get current values from metadata: {e}")
+                metadata = {}
             
             return {
                 'camera': 'hq',
-                'auto_exposure': self.get_auto_exposure(),
-                'exposure_time': exposure_time,
-                'gain': gain,
-                'brightness': brightness,
-                'contrast': contrast
+                'auto_exposure': self._is_auto_exposure,
+                'exposure_time': int(metadata.get('ExposureTime', 33000)),
+                'gain': float(metadata.get('AnalogueGain', 4.0)),
+                'brightness': float(metadata.get('Brightness', 0.0)),
+                'contrast': float(metadata.get('Contrast', 1.0))
             }
         except Exception as e:
             logger.error(f"Error getting HQ camera settings: {e}")
@@ -601,43 +638,46 @@ class HQCamera:
             logger.error(f"Error applying dynamic exposure: {e}")
             return {'error': str(e)}
     
-    def set_day_mode(self) -> dict:
-        """Set camera to day mode settings"""
+    def _apply_manual_preset(self, preset: dict):
+        """Switch to manual exposure and apply a preset in one set_controls call"""
+        self._camera.set_controls({**_AE_OFF, **preset})
+        self._applied.update(exposure=preset['ExposureTime'], gain=preset['AnalogueGain'],
+                             brightness=preset['Brightness'], contrast=preset['Contrast'])
+        self._is_auto_exposure = False
+        Config.CAMERA_SETTINGS['hq_camera']['auto_exposure'] = False
+        logger.info(f"HQ camera manual mode: exposure={preset['ExposureTime']}μs, gain={preset['AnalogueGain']}, "
+                    f"brightness={preset['Brightness']}, contrast={preset['Contrast']}")
+    
+    def _set_preset_mode(self, mode: str, preset: dict) -> dict:
+        """Apply a day/night preset and build the API response"""
+        if not self._camera or not self._active:
+            return {'error': 'Camera not available'}
+        
         try:
-            self.set_auto_exposure(False)  # Switch to manual
-            self.set_exposure(3000)        # 3ms
-            self.set_gain(1.0)            # Minimal gain
-            self.set_brightness(0.0)       # No brightness boost
-            self.set_contrast(0.9)         # Slightly reduced contrast
+            self._apply_manual_preset(preset)
             
-            logger.info("HQ camera set to day mode")
+            logger.info(f"HQ camera set to {mode} mode")
             return {
                 'success': True,
-                'mode': 'day',
-                'settings': {'exposure_time': 3000, 'gain': 1.0, 'brightness': 0.0, 'contrast': 0.9}
+                'mode': mode,
+                'settings': {
+                    'exposure_time': preset['ExposureTime'],
+                    'gain': preset['AnalogueGain'],
+                    'brightness': preset['Brightness'],
+                    'contrast': preset['Contrast']
+                }
             }
         except Exception as e:
-            logger.error(f"Error setting day mode: {e}")
+            logger.error(f"Error setting {mode} mode: {e}")
             return {'error': str(e)}
     
+    def set_day_mode(self) -> dict:
+        """Set camera to day mode settings"""
+        return self._set_preset_mode('day', _DAY_PRESET)
+    
     def set_night_mode(self) -> dict:
         """Set camera to night mode settings"""
-        try:
-            self.set_auto_exposure(False)  # Switch to manual
-            self.set_exposure(40000)       # 40ms
-            self.set_gain(6.0)            # Higher gain (less than IR)
-            self.set_brightness(0.1)       # Slight brightness boost
-            self.set_contrast(1.1)         # Higher contrast
-            
-            logger.info("HQ camera set to night mode")
-            return {
-                'success': True,
-                'mode': 'night',
-                'settings': {'exposure_time': 40000, 'gain': 6.0, 'brightness': 0.1, 'contrast': 1.1}
-            }
-        except Exception as e:
-            logger.error(f"Error setting night mode: {e}")
-            return {'error': str(e)}
+        return self._set_preset_mode('night', _NIGHT_PRESET)
 
     def get_contrast(self) -> float:
         """Get current contrast"""
@@ -649,8 +689,72 @@ class HQCamera:
                 return 1.0
         return 1.0
 
-    def capture_still(self, filepath: str, high_quality: bool = True) -> bool:
-        """Capture a high-quality still image outside of the preview stream"""
+    def apply_settings_batch(self, settings: dict) -> Optional[dict]:
+        """Apply multiple camera settings in one set_controls call; returns the settings that took effect, or None on failure"""
+        if not self._camera or not self._active:
+            return None
+            
+        try:
+            auto_exposure = bool(settings.get('auto_exposure', self._is_auto_exposure))
+            mode_changed = auto_exposure != self._is_auto_exposure
+            controls = {}
+            applied = {}
+            if 'auto_exposure' in settings:
+                applied['auto_exposure'] = auto_exposure
+            
+            # Exposure mode switch rides in the same set_controls call as the values below
+            if mode_changed:
+                controls.update({"AeEnable": True, "AeConstraintMode": 0} if auto_exposure else _AE_OFF)
+            
+            if not auto_exposure:  # Only apply manual settings if in manual mode
+                if 'exposure_time' in settings:
+                    controls['ExposureTime'] = applied['exposure_time'] = int(settings['exposure_time'])
+                if 'gain' in settings:
+                    controls['AnalogueGain'] = applied['gain'] = float(settings['gain'])
+            
+            # These can be applied in both modes
+            if 'brightness' in settings:
+                controls['Brightness'] = applied['brightness'] = max(-1.0, min(1.0, float(settings['brightness'])))
+            if 'contrast' in settings:
+                controls['Contrast'] = applied['contrast'] = max(0.0, min(2.0, float(settings['contrast'])))
+            
+            # Skip values the camera already has
+            for key, control in _CONTROL_KEYS:
+                if control in controls and self._is_applied(key, controls[control]):
+                    del controls[control]
+            
+            # Apply all controls at once
+            if controls:
+                self._camera.set_controls(controls)
+                for key, control in _CONTROL_KEYS:
+                    if control in controls:
+                        self._applied[key] = controls[control]
+                logger.info(f"HQ camera batch settings applied: {controls}")
+            
+            if mode_changed:
+                self._is_auto_exposure = auto_exposure
+                Config.CAMERA_SETTINGS['hq_camera']['auto_exposure'] = auto_exposure
+                if auto_exposure:
+                    # AE now drives exposure and gain, so cached manual values are stale
+                    self._applied['exposure'] = self._applied['gain'] = None
+                logger.info(f"HQ camera switched to {'auto' if auto_exposure else 'manual'} exposure mode")
+            
+            return applied
+            
+        except Exception as e:
+            logger.error(f"Failed to apply batch settings to HQ camera: {e}")
+            return None
+
+    def capture_still(self, filepath: str, high_quality: bool = True,
+                      resolution: Tuple[int, int] = (4056, 3040)) -> bool:
+        """Capture a high-quality still image outside of the preview stream
+
+        resolution sets the output size of high-quality captures. The raw stream
+        stays at full sensor size so smaller outputs are downscaled by the ISP.
+        With high_quality=False the still is taken from the running video
+        configuration without a mode switch, so it is saved at the streaming
+        resolution (self.resolution), not at full sensor size.
+        """
         if not self._active or not self._camera:
             logger.error("Camera not active for still capture")
             return False
@@ -660,17 +764,17 @@ class HQCamera:
             if high_quality:
                 # Temporarily switch to still configuration for maximum quality
                 still_config = self._camera.create_still_configuration(
-                    main={"size": (4056, 3040)},  # Full IMX477 sensor resolution
-                    raw={"size": (4056, 3040)},
+                    main={"size": resolution},  # ISP scales to the requested size
+                    raw={"size": (4056, 3040)},  # Full IMX477 sensor resolution
                     # Apply 180-degree rotation for upside-down camera mounting
                     transform=Transform(hflip=1, vflip=1)
                 )
                 
                 # Capture with the still configuration
                 self._camera.switch_mode_and_capture_file(still_config, filepath)
-                logger.info(f"High-quality still captured to {filepath}")
+                logger.info(f"High-quality still captured to {filepath} at {resolution[0]}x{resolution[1]}")
             else:
-                # Use current video configuration for faster capture
+                # Use current video configuration for faster capture (streaming resolution)
                 self._camera.capture_file(filepath)
                 logger.info(f"Still captured to {filepath}")
             
@@ -4,12 +4,15 @@ Handles the IR-sensitive camera for motion detection
 """
 
 import logging
+import queue
 import threading
 import time
 import cv2
 import numpy as np
 from typing import Optional, Tuple
-from picamera2 import Picamera2
+from picamera2 import MappedArray, Picamera2
+from picamera2.encoders import MJPEGEncoder
+from picamera2.outputs import FileOutput
 from libcamera import Transform
 
 from .streaming import StreamingOutput
@@ -17,6 +20,18 @@ from config.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Manual exposure mode controls (AeConstraintMode 3 = Manual)
+_AE_OFF = {"AeEnable": False, "AeConstraintMode": 3}
+
+# _applied cache key -> libcamera control name
+_CONTROL_KEYS = (('exposure', 'ExposureTime'), ('gain', 'AnalogueGain'),
+                 ('brightness', 'Brightness'), ('contrast', 'Contrast'))
+
+# Day/night manual presets, applied together with _AE_OFF in a single set_controls call
+# Day: 5ms minimal exposure; night: 50ms with higher gain and contrast
+_DAY_PRESET = {"ExposureTime": 5000, "AnalogueGain": 1.0, "Brightness": 0.0, "Contrast": 0.8}
+_NIGHT_PRESET = {"ExposureTime": 50000, "AnalogueGain": 8.0, "Brightness": 0.2, "Contrast": 1.2}
+
 class IRCamera:
     """IR-sensitive camera handler for motion detection"""
     
@@ -31,9 +46,22 @@ class IRCamera:
         self._lock = threading.Lock()
         self._active = False
         self._streaming = False
-        self._capture_thread: Optional[threading.Thread] = None
+        self._encode_thread: Optional[threading.Thread] = None
+        self._hw_encoder: Optional[MJPEGEncoder] = None
+        # The hardware encoder only runs while the stream has viewers; guarded by its own lock
+        # because viewer changes arrive under the streaming output's viewer lock
+        self._hw_running = False
+        self._encoder_lock = threading.Lock()
+        # Single-slot drop-oldest handoff so JPEG encoding never stalls capture
+        self._out_queue: queue.Queue = queue.Queue(maxsize=1)
         self._latest_frame: Optional[np.ndarray] = None
+        # Optional lores YUV420 stream whose Y plane feeds grayscale consumers (motion detection)
+        self._luma_stream = Config.CAMERA_SETTINGS['ir_camera'].get('luma_stream', False)
+        self._luma_size = tuple(Config.MOTION_DETECTION.get('detect_resolution') or self.resolution)
+        self._latest_luma: Optional[np.ndarray] = None
         self._is_auto_exposure = Config.CAMERA_SETTINGS['ir_camera']['auto_exposure']
+        # Last values sent via set_controls, used to skip no-op control updates
+        self._applied = {'exposure': None, 'gain': None, 'brightness': None, 'contrast': None}
         
         self._initialize_camera()
     
@@ -60,22 +88,34 @@ class IRCamera:
             else:
                 controls["AeEnable"] = True
             
-            # Configure for both streaming (lores) and still capture (main)
-            # For IR camera (IMX219): max resolution 3280x2464, streaming at configured resolution
-            max_resolution = (3280, 2464)  # IMX219 max resolution
+            # Main stream at streaming resolution; the lores stream only exists when luma_stream is enabled
+            # Full-sensor (3280x2464) stills reconfigure on demand in capture_still(high_quality=True)
+            # The ISP scales lores to the motion-detection resolution when one is configured
+            lores = {"format": "YUV420", "size": self._luma_size} if self._luma_stream else None
             config = self._camera.create_video_configuration(
-                main={"format": "RGB888", "size": max_resolution},  # High-res for still capture
-                lores={"format": "RGB888", "size": self.resolution},  # Lower res for streaming
+                main={"format": "RGB888", "size": self.resolution},
+                lores=lores,
                 controls=controls,
                 # Apply 180-degree rotation for upside-down camera mounting
                 transform=Transform(hflip=1, vflip=1)
             )
             
             self._camera.configure(config)
+            # Frames are delivered by Picamera2's own thread through post_callback
+            self._camera.post_callback = self._on_frame
             self._camera.start()
             
+            # Optionally let the VideoCore hardware encoder produce the stream JPEGs;
+            # a per-camera setting overrides the global STREAMING default
+            encode_on_gpu = Config.CAMERA_SETTINGS['ir_camera'].get('encode_on_gpu')
+            if encode_on_gpu is None:
+                encode_on_gpu = Config.STREAMING.get('encode_on_gpu', False)
+            if encode_on_gpu:
+                self._hw_encoder = MJPEGEncoder()
+            
             # Initialize streaming output
-            self._streaming_output = StreamingOutput()
+            self._streaming_output = StreamingOutput(
+                on_viewers_changed=self._on_viewers_changed if self._hw_encoder else None)
             
             self._active = True
             logger.info(f"IR camera {self.camera_index} initialized successfully")
@@ -100,9 +140,15 @@ class IRCamera:
                 # Set streaming flag BEFORE starting thread to avoid race condition
                 self._streaming = True
                 
-                # Start capture thread
-                self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
-                self._capture_thread.start()
+                if self._hw_encoder:
+                    # Hardware encoder writes finished JPEGs straight into the streaming output
+                    # while someone is watching; viewer changes start and stop it from here on
+                    with self._encoder_lock:
+                        self._set_hw_encoding(self._streaming_output.get_viewer_count() > 0)
+                else:
+                    # Frames arrive via post_callback; start the encoder thread that feeds the stream
+                    self._encode_thread = threading.Thread(target=self._encode_loop, daemon=True)
+                    self._encode_thread.start()
                 
                 logger.info("IR camera streaming started")
                 return True
@@ -120,47 +166,106 @@ class IRCamera:
             
             self._streaming = False
             
-            if self._capture_thread and self._capture_thread.is_alive():
-                self._capture_thread.join(timeout=5.0)
+            if self._hw_encoder:
+                with self._encoder_lock:
+                    try:
+                        self._set_hw_encoding(False)
+                    except Exception as e:
+                        logger.error(f"Error stopping IR camera hardware encoder: {e}")
+            
+            if self._encode_thread and self._encode_thread.is_alive():
+                self._encode_thread.join(timeout=5.0)
             
             logger.info("IR camera streaming stopped")
     
-    def _capture_loop(self):
-        """Main capture loop for streaming"""
-        logger.info("IR camera capture loop started")
-        frame_count = 0
+    def _set_hw_encoding(self, running: bool):
+        """Start or stop the hardware encoder (caller holds _encoder_lock)"""
+        if running == self._hw_running:
+            return
+        
+        if running:
+            self._camera.start_encoder(self._hw_encoder, FileOutput(self._streaming_output))
+        else:
+            self._camera.stop_encoder(self._hw_encoder)
+        self._hw_running = running
+    
+    def _on_viewers_changed(self, watching: bool):
+        """StreamingOutput hook: run the hardware encoder only while the stream has viewers"""
+        with self._encoder_lock:
+            if not self._streaming or not self._active:
+                return
+            
+            try:
+                self._set_hw_encoding(watching)
+                logger.info(f"IR camera hardware encoder {'started' if watching else 'paused'}")
+            except Exception as e:
+                logger.error(f"Error switching IR camera hardware encoder: {e}")
+    
+    def _on_frame(self, request):
+        """Picamera2 post_callback: publish each completed frame while streaming"""
+        if not self._streaming or not self._active:
+            return
+        
+        # Stills captured through switch_mode_and_capture_file also pass through here at full sensor size
+        if tuple(request.config["main"]["size"]) != tuple(self.resolution):
+            return
+        
+        try:
+            # Frame is in RGB format from Picamera2
+            frame = request.make_array("main")
+            
+            luma = None
+            if self._luma_stream:
+                # Copy only the Y plane out of the mapped YUV420 buffer (first height rows, stride-padded)
+                width, height = self._luma_size
+                with MappedArray(request, "lores") as mapped:
+                    luma = mapped.array[:height, :width].copy()
+                luma.flags.writeable = False
+            
+            # Cache the latest frame for get_frame() calls
+            with self._lock:
+                self._latest_frame = frame
+                self._latest_luma = luma
+            
+            # Hand off to the encoder thread, replacing any frame it hasn't taken yet
+            if not self._hw_encoder:
+                self._publish_frame(frame)
+            
+        except Exception as e:
+            logger.error(f"Error in IR camera frame callback: {e}")
+    
+    def _publish_frame(self, frame: np.ndarray):
+        """Queue a frame for encoding, dropping the oldest one if the encoder is behind"""
+        try:
+            self._out_queue.put_nowait(frame)
+        except queue.Full:
+            try:
+                self._out_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._out_queue.put_nowait(frame)
+    
+    def _encode_loop(self):
+        """Encoder loop feeding queued frames to the streaming output"""
+        logger.info("IR camera encode loop started")
         
         while self._streaming and self._active:
             try:
-                # Capture frame from lores stream for streaming
-                frame = self._camera.capture_array("lores")
-                
-                if frame is not None:
-                    frame_count += 1
-                    if frame_count % 30 == 0:  # Log every 30 frames
-                        pass  # Logging disabled to reduce spam
-                    
-                    # Cache the latest frame for get_frame() calls
-                    with self._lock:
-                        self._latest_frame = frame.copy()
-                    
-                    # Frame is in RGB format from Picamera2
-                    # Pass to streaming output which will handle conversion for JPEG encoding
-                    if self._streaming_output:
-                        self._streaming_output.write_frame(frame)
-                    else:
-                        logger.warning("No streaming output available for IR camera")
-                
-                # Dynamic frame timing - don't force fixed FPS
-                # The camera will naturally pace based on exposure time
-                # Just prevent CPU spinning with minimal sleep
-                time.sleep(0.001)  # 1ms minimal sleep
-                
+                frame = self._out_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            try:
+                # Frame is in RGB format from Picamera2
+                # Pass to streaming output which will handle conversion for JPEG encoding
+                if self._streaming_output:
+                    self._streaming_output.write_frame(frame)
+                else:
+                    logger.warning("No streaming output available for IR camera")
             except Exception as e:
-                logger.error(f"Error in IR camera capture loop: {e}")
-                time.sleep(0.1)
+                logger.error(f"Error in IR camera encode loop: {e}")
         
-        logger.info("IR camera capture loop ended")
+        logger.info("IR camera encode loop ended")
     
     def get_frame(self) -> Optional[np.ndarray]:
         """Get the current cached frame (NEVER captures directly to avoid blocking)"""
@@ -180,6 +285,22 @@ class IRCamera:
         
         return None
     
+    def get_luma_frame(self) -> Optional[np.ndarray]:
+        """Get the latest cached luma (grayscale) plane, or None if the luma stream is disabled"""
+        if not self._active:
+            return None
+        
+        # Read-only and replaced every frame, so it is shared without copying
+        with self._lock:
+            return self._latest_luma
+    
+    def get_encoded_frame(self) -> Optional[memoryview]:
+        """Get the latest hardware-encoded JPEG, or None when the hardware encoder is not running"""
+        # Encoders only run while someone is watching, so a paused encoder's output is stale
+        if not self._active or not self._hw_running or not self._streaming_output:
+            return None
+        return self._streaming_output.get_frame_data()
+    
     def get_stream(self):
         """Get the streaming generator for Flask"""
         if self._streaming_output:
@@ -191,6 +312,8 @@ class IRCamera:
     def set_exposure(self, exposure_time: int):
         """Set exposure time in microseconds"""
         if self._camera and self._active:
+            if not self._is_auto_exposure and self._is_applied('exposure', exposure_time):
+                return True
             try:
                 # Only switch to manual mode if we're currently in auto mode
                 if self._is_auto_exposure:
@@ -208,6 +331,7 @@ class IRCamera:
                 self._camera.set_controls({
                     "ExposureTime": exposure_time
                 })
+                self._applied['exposure'] = exposure_time
                 
                 logger.info(f"IR camera exposure set to {exposure_time}μs")
                 return True
@@ -218,6 +342,8 @@ class IRCamera:
     def set_gain(self, gain: float):
         """Set analogue gain"""
         if self._camera and self._active:
+            if not self._is_auto_exposure and self._is_applied('gain', gain):
+                return True
             try:
                 # Only switch to manual mode if we're currently in auto mode
                 if self._is_auto_exposure:
@@ -235,12 +361,18 @@ class IRCamera:
                 self._camera.set_controls({
                     "AnalogueGain": gain
                 })
+                self._applied['gain'] = gain
                 logger.info(f"IR camera gain set to {gain}")
                 return True
             except Exception as e:
                 logger.error(f"Failed to set IR camera gain: {e}")
         return False
     
+    def _is_applied(self, key: str, value: float) -> bool:
+        """Check whether a control value matches the last one applied"""
+        applied = self._applied[key]
+        return applied is not None and abs(applied - value) < 1e-3
+    
     def is_active(self) -> bool:
         """Check if camera is active"""
         return self._active
@@ -282,7 +414,7 @@ class IRCamera:
     
     def get_auto_exposure(self) -> bool:
         """Get auto exposure status"""
-        return Config.CAMERA_SETTINGS['ir_camera']['auto_exposure']
+        return self._is_auto_exposure
     
     def set_auto_exposure(self, enabled: bool) -> bool:
         """Enable or disable auto exposure"""
@@ -298,38 +430,18 @@ class IRCamera:
                     })
                     self._is_auto_exposure = True
                     Config.CAMERA_SETTINGS['ir_camera']['auto_exposure'] = True
+                    # AE now drives exposure and gain, so cached manual values are stale
+                    self._applied['exposure'] = self._applied['gain'] = None
                     logger.info("IR camera auto exposure enabled")
                 elif not enabled and self._is_auto_exposure:
                     # Switch to manual mode with day/night defaults
                     import datetime
                     current_hour = datetime.datetime.now().hour
-                    
-                    if 6 <= current_hour <= 20:  # Daytime (6 AM to 8 PM)
-                        exposure_time = 5000   # 5ms - minimal for daytime
-                        gain = 1.0            # Minimal gain
-                        brightness = 0.0      # No brightness boost
-                        contrast = 0.8        # Reduced contrast for day
-                        logger.info("IR camera switching to manual mode with daytime defaults")
-                    else:  # Nighttime
-                        exposure_time = 50000  # 50ms - longer for night
-                        gain = 8.0            # Higher gain for night
-                        brightness = 0.2      # Slight brightness boost
-                        contrast = 1.2        # Higher contrast for night
-                        logger.info("IR camera switching to manual mode with nighttime defaults")
+                    daytime = 6 <= current_hour <= 20  # Daytime (6 AM to 8 PM)
+                    logger.info(f"IR camera switching to manual mode with {'daytime' if daytime else 'nighttime'} defaults")
                     
                     # Switch to manual mode WITHOUT frame duration limits
-                    self._camera.set_controls({
-                        "AeEnable": False,
-                        "AeConstraintMode": 3,  # Manual mode
-                        "ExposureTime": exposure_time,
-                        "AnalogueGain": gain,
-                        "Brightness": brightness,
-                        "Contrast": contrast
-                        # NO FrameDurationLimits - this interferes with manual settings
-                    })
-                    self._is_auto_exposure = False
-                    Config.CAMERA_SETTINGS['ir_camera']['auto_exposure'] = False
-                    logger.info(f"IR camera manual mode: exposure={exposure_time}μs, gain={gain}, brightness={brightness}, contrast={contrast}")
+                    self._apply_manual_preset(_DAY_PRESET if daytime else _NIGHT_PRESET)
                 else:
                     # Already in the requested mode
                     logger.debug(f"IR camera already in {'auto' if enabled else 'manual'} exposure mode")
@@ -344,7 +456,10 @@ class IRCamera:
             try:
                 # Clamp brightness to valid range
                 brightness = max(-1.0, min(1.0, brightness))
+                if self._is_applied('brightness', brightness):
+                    return True
                 self._camera.set_controls({"Brightness": brightness})
+                self._applied['brightness'] = brightness
                 logger.info(f"IR camera brightness set to {brightness}")
                 return True
             except Exception as e:
@@ -367,7 +482,10 @@ class IRCamera:
             try:
                 # Clamp contrast to valid range
                 contrast = max(0.0, min(2.0, contrast))
+                if self._is_applied('contrast', contrast):
+                    return True
                 self._camera.set_controls({"Contrast": contrast})
+                self._applied['contrast'] = contrast
                 logger.info(f"IR camera contrast set to {contrast}")
                 return True
             except Exception as e:
@@ -380,32 +498,20 @@ class IRCamera:
             if not self._camera:
                 return {'error': 'Camera not initialized'}
             
-            # Get current controls from camera
-            controls = self._camera.camera_controls
-            
-            # Extract current values from controls (they return tuples with min,max,default)
-            exposure_time = 33000
-            gain = 4.0
-            brightness = 0.0
-            contrast = 1.0
-            
             try:
-                # Get actual current values using capture_metadata
+                # Single capture_metadata call provides all current values
                 metadata = self._camera.capture_metadata()
-                exposure_time = int(metadata.get('ExposureTime', 33000))
-                gain = float(metadata.get('AnalogueGain', 4.0))
-                brightness = float(metadata.get('Brightness', 0.0)) 
-                contrast = float(metadata.get('Contrast', 1.0))
             except Exception as e:
                 logger.debug(f"Could not get current values from metadata: {e}")
+                metadata = {}
             
             return {
                 'camera': 'ir',
-                'auto_exposure': self.get_auto_exposure(),
-                'exposure_time': exposure_time,
-                'gain': gain,
-                'brightness': brightness,
-                'contrast': contrast
+                'auto_exposure': self._is_auto_exposure,
+                'exposure_time': int(metadata.get('ExposureTime', 33000)),
+                'gain': float(metadata.get('AnalogueGain', 4.0)),
+                'brightness': float(metadata.get('Brightness', 0.0)),
+                'contrast': float(metadata.get('Contrast', 1.0))
             }
         except Exception as e:
             logger.error(f"Error getting IR camera settings: {e}")
@@ -538,44 +644,47 @@ class IRCamera:
             logger.error(f"Error applying dynamic exposure: {e}")
             return {'error': str(e)}
     
-    def set_day_mode(self) -> dict:
-        """Set camera to day mode settings"""
+    def _apply_manual_preset(self, preset: dict):
+        """Switch to manual exposure and apply a preset in one set_controls call"""
+        self._camera.set_controls({**_AE_OFF, **preset})
+        self._applied.update(exposure=preset['ExposureTime'], gain=preset['AnalogueGain'],
+                             brightness=preset['Brightness'], contrast=preset['Contrast'])
+        self._is_auto_exposure = False
+        Config.CAMERA_SETTINGS['ir_camera']['auto_exposure'] = False
+        logger.info(f"IR camera manual mode: exposure={preset['ExposureTime']}μs, gain={preset['AnalogueGain']}, "
+                    f"brightness={preset['Brightness']}, contrast={preset['Contrast']}")
+    
+    def _set_preset_mode(self, mode: str, preset: dict) -> dict:
+        """Apply a day/night preset and build the API response"""
+        if not self._camera or not self._active:
+            return {'error': 'Camera not available'}
+        
         try:
-            self.set_auto_exposure(False)  # Switch to manual
-            self.set_exposure(5000)        # 5ms
-            self.set_gain(1.0)            # Minimal gain
-            self.set_brightness(0.0)       # No brightness boost
-            self.set_contrast(0.8)         # Reduced contrast
+            self._apply_manual_preset(preset)
             
-            logger.info("IR camera set to day mode")
+            logger.info(f"IR camera set to {mode} mode")
             return {
                 'success': True,
-                'mode': 'day',
-                'settings': {'exposure_time': 5000, 'gain': 1.0, 'brightness': 0.0, 'contrast': 0.8}
+                'mode': mode,
+                'settings': {
+                    'exposure_time': preset['ExposureTime'],
+                    'gain': preset['AnalogueGain'],
+                    'brightness': preset['Brightness'],
+                    'contrast': preset['Contrast']
+                }
             }
         except Exception as e:
-            logger.error(f"Error setting day mode: {e}")
+            logger.error(f"Error setting {mode} mode: {e}")
             return {'error': str(e)}
     
+    def set_day_mode(self) -> dict:
+        """Set camera to day mode settings"""
+        return self._set_preset_mode('day', _DAY_PRESET)
+    
     def set_night_mode(self) -> dict:
         """Set camera to night mode settings"""
-        try:
-            self.set_auto_exposure(False)  # Switch to manual
-            self.set_exposure(50000)       # 50ms
-            self.set_gain(8.0)            # Higher gain
-            self.set_brightness(0.2)       # Slight brightness boost
-            self.set_contrast(1.2)         # Higher contrast
-            
-            logger.info("IR camera set to night mode")
-            return {
-                'success': True,
-                'mode': 'night',
-                'settings': {'exposure_time': 50000, 'gain': 8.0, 'brightness': 0.2, 'contrast': 1.2}
-            }
-        except Exception as e:
-            logger.error(f"Error setting night mode: {e}")
-            return {'error': str(e)}
-    
+        return self._set_preset_mode('night', _NIGHT_PRESET)
+
     def get_contrast(self) -> float:
         """Get current contrast"""
         if self._camera and self._active:
@@ -586,68 +695,72 @@ class IRCamera:
                 return 1.0
         return 1.0
 
-    def apply_settings_batch(self, settings: dict) -> bool:
-        """Apply multiple camera settings in one batch to minimize disruption"""
+    def apply_settings_batch(self, settings: dict) -> Optional[dict]:
+        """Apply multiple camera settings in one set_controls call; returns the settings that took effect, or None on failure"""
         if not self._camera or not self._active:
-            return False
+            return None
             
         try:
-            # Check if we need to change exposure mode
-            auto_exposure = settings.get('auto_exposure', self._is_auto_exposure)
-            mode_changed = False
+            auto_exposure = bool(settings.get('auto_exposure', self._is_auto_exposure))
+            mode_changed = auto_exposure != self._is_auto_exposure
+            controls = {}
+            applied = {}
+            if 'auto_exposure' in settings:
+                applied['auto_exposure'] = auto_exposure
             
-            if auto_exposure != self._is_auto_exposure:
-                if auto_exposure:
-                    # Switch to auto exposure
-                    self._camera.set_controls({
-                        "AeEnable": True,
-                        "AeConstraintMode": 0
-                    })
-                    self._is_auto_exposure = True
-                    Config.CAMERA_SETTINGS['ir_camera']['auto_exposure'] = True
-                    logger.info("IR camera switched to auto exposure mode")
-                else:
-                    # Switch to manual exposure
-                    self._camera.set_controls({
-                        "AeEnable": False,
-                        "AeConstraintMode": 3
-                    })
-                    self._is_auto_exposure = False
-                    Config.CAMERA_SETTINGS['ir_camera']['auto_exposure'] = False
-                    logger.info("IR camera switched to manual exposure mode")
-                mode_changed = True
-                
-                # Give camera time to switch modes
-                import time
-                time.sleep(0.15)
+            # Exposure mode switch rides in the same set_controls call as the values below
+            if mode_changed:
+                controls.update({"AeEnable": True, "AeConstraintMode": 0} if auto_exposure else _AE_OFF)
             
-            # Now apply other settings in one batch
-            controls = {}
             if not auto_exposure:  # Only apply manual settings if in manual mode
                 if 'exposure_time' in settings:
-                    controls['ExposureTime'] = int(settings['exposure_time'])
+                    controls['ExposureTime'] = applied['exposure_time'] = int(settings['exposure_time'])
                 if 'gain' in settings:
-                    controls['AnalogueGain'] = float(settings['gain'])
+                    controls['AnalogueGain'] = applied['gain'] = float(settings['gain'])
             
             # These can be applied in both modes
             if 'brightness' in settings:
-                controls['Brightness'] = max(-1.0, min(1.0, float(settings['brightness'])))
+                controls['Brightness'] = applied['brightness'] = max(-1.0, min(1.0, float(settings['brightness'])))
             if 'contrast' in settings:
-                controls['Contrast'] = max(0.0, min(2.0, float(settings['contrast'])))
+                controls['Contrast'] = applied['contrast'] = max(0.0, min(2.0, float(settings['contrast'])))
+            
+            # Skip values the camera already has
+            for key, control in _CONTROL_KEYS:
+                if control in controls and self._is_applied(key, controls[control]):
+                    del controls[control]
             
             # Apply all controls at once
             if controls:
                 self._camera.set_controls(controls)
+                for key, control in _CONTROL_KEYS:
+                    if control in controls:
+                        self._applied[key] = controls[control]
                 logger.info(f"IR camera batch settings applied: {controls}")
             
-            return True
+            if mode_changed:
+                self._is_auto_exposure = auto_exposure
+                Config.CAMERA_SETTINGS['ir_camera']['auto_exposure'] = auto_exposure
+                if auto_exposure:
+                    # AE now drives exposure and gain, so cached manual values are stale
+                    self._applied['exposure'] = self._applied['gain'] = None
+                logger.info(f"IR camera switched to {'auto' if auto_exposure else 'manual'} exposure mode")
+            
+            return applied
             
         except Exception as e:
             logger.error(f"Failed to apply batch settings to IR camera: {e}")
-            return False
+            return None
+
+    def capture_still(self, filepath: str, high_quality: bool = True,
+                      resolution: Tuple[int, int] = (3280, 2464)) -> bool:
+        """Capture a still image outside of the preview stream
 
-    def capture_still(self, filepath: str, high_quality: bool = True) -> bool:
-        """Capture a still image outside of the preview stream"""
+        resolution sets the output size of high-quality captures. The raw stream
+        stays at full sensor size so smaller outputs are downscaled by the ISP.
+        With high_quality=False the still is taken from the running video
+        configuration without a mode switch, so it is saved at the streaming
+        resolution (self.resolution), not at full sensor size.
+        """
         if not self._active or not self._camera:
             logger.error("IR camera not active for still capture")
             return False
@@ -656,16 +769,16 @@ class IRCamera:
             if high_quality:
                 # Switch to still configuration for full resolution capture
                 still_config = self._camera.create_still_configuration(
-                    main={"size": (3280, 2464)},  # Full IMX219 sensor resolution
-                    raw={"size": (3280, 2464)},
+                    main={"size": resolution},  # ISP scales to the requested size
+                    raw={"size": (3280, 2464)},  # Full IMX219 sensor resolution
                     # Apply 180-degree rotation for upside-down camera mounting
                     transform=Transform(hflip=1, vflip=1)
                 )
                 # Capture with the still configuration
                 self._camera.switch_mode_and_capture_file(still_config, filepath)
-                logger.info(f"High-quality IR still captured to {filepath} at 3280x2464")
+                logger.info(f"High-quality IR still captured to {filepath} at {resolution[0]}x{resolution[1]}")
             else:
-                # Use current video configuration for faster capture
+                # Use current video configuration for faster capture (streaming resolution)
                 self._camera.capture_file(filepath)
                 logger.info(f"IR still captured to {filepath}")
             return True
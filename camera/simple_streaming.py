@@ -5,25 +5,39 @@ Minimal implementation without viewer management for testing
 
 import logging
 import threading
-import time
 import cv2
 from typing import Generator, Optional
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# Constant MJPEG framing, yielded around each frame so the JPEG itself is never copied
+_BOUNDARY = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+_TRAILER = b'\r\n'
+
 class SimpleStreamingOutput:
     """Simple streaming output without viewer management"""
     
+    __slots__ = ('_current_frame_data', '_frame_seq', '_frame_cond', '_active',
+                 '_frame_lock', '_jpeg_quality', '_encode_params')
+    
     def __init__(self):
         """Initialize streaming output"""
         self._current_frame_data: Optional[bytes] = None
         self._frame_lock = threading.RLock()
+        self._frame_seq = 0
+        self._frame_cond = threading.Condition(self._frame_lock)
         self._active = True
         
         # Frame encoding settings
         self._jpeg_quality = 85
-        self._encode_params = [cv2.IMWRITE_JPEG_QUALITY, self._jpeg_quality]
+        # Baseline JPEG: no Huffman optimization pass, no progressive scans, no restart markers
+        self._encode_params = [
+            cv2.IMWRITE_JPEG_QUALITY, self._jpeg_quality,
+            cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+            cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
+            cv2.IMWRITE_JPEG_RST_INTERVAL, 0
+        ]
         
         logger.info("Simple streaming output initialized")
     
@@ -33,18 +47,14 @@ class SimpleStreamingOutput:
             return
         
         try:
-            # Convert RGB to BGR for OpenCV (Picamera2 returns RGB)
-            if len(frame.shape) == 3 and frame.shape[2] == 3:
-                frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-            else:
-                frame_bgr = frame
-                
-            # Encode frame to JPEG
-            success, buffer = cv2.imencode('.jpg', frame_bgr, self._encode_params)
+            # Encode frame to JPEG directly - browsers accept RGB-ordered JPEGs
+            success, buffer = cv2.imencode('.jpg', frame, self._encode_params)
             if success:
-                # Store frame data directly as bytes
-                with self._frame_lock:
+                # Store frame data directly as bytes and wake waiting viewers
+                with self._frame_cond:
                     self._current_frame_data = buffer.tobytes()
+                    self._frame_seq += 1
+                    self._frame_cond.notify_all()
                     if len(self._current_frame_data) > 0:
                         logger.debug(f"Frame written: {len(self._current_frame_data)} bytes")
         
@@ -56,24 +66,25 @@ class SimpleStreamingOutput:
         logger.info(f"New stream connection")
         
         try:
+            last_seq = -1
             while self._active:
-                # Get current frame data
+                # Wait for a new frame instead of polling
                 frame_data = None
-                with self._frame_lock:
+                with self._frame_cond:
+                    self._frame_cond.wait_for(
+                        lambda: self._frame_seq != last_seq or not self._active, timeout=1.0)
+                    last_seq = self._frame_seq
                     if self._current_frame_data:
                         frame_data = self._current_frame_data
                 
                 if frame_data:
                     # Send frame using proper MJPEG format
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + 
-                           frame_data + b'\r\n')
+                    yield _BOUNDARY
+                    yield frame_data
+                    yield _TRAILER
                     logger.debug(f"Frame sent: {len(frame_data)} bytes")
                 else:
                     logger.debug("No frame data available")
-                
-                # Control frame rate
-                time.sleep(0.1)  # 10 FPS
         
         finally:
             logger.info(f"Stream connection closed")
@@ -82,5 +93,6 @@ class SimpleStreamingOutput:
         """Cleanup streaming resources"""
         logger.info("Cleaning up simple streaming output...")
         self._active = False
-        with self._frame_lock:
-            self._current_frame_data = None
\ No newline at end of file
+        with self._frame_cond:
+            self._current_frame_data = None
+            self._frame_cond.notify_all()
\ No newline at end of file
@@ -3,129 +3,233 @@ Streaming Output Handler for UFO Tracker
 Manages video streaming for multiple concurrent viewers
 """
 
+import itertools
 import logging
 import threading
 import time
 import cv2
-from typing import Generator, Optional, Set
+from typing import Callable, Generator, List, Optional
 from collections import deque
 
 from config.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Optional PyTurboJPEG for direct libjpeg-turbo (NEON SIMD) encoding, falls back to cv2.imencode
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420, TJFLAG_FASTDCT
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+
+# Optional simplejpeg (bundles libjpeg-turbo in its wheel, no system library needed)
+# ValueError covers wheels built against a different numpy ABI
+try:
+    import simplejpeg
+    SIMPLEJPEG_AVAILABLE = True
+except (ImportError, ValueError):
+    SIMPLEJPEG_AVAILABLE = False
+
+# MJPEG part template; each frame is framed once in write_frame and shared by all viewers
+_FRAME_TEMPLATE = b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n%s\r\n'
+
+# Ring of recently published MJPEG parts for viewer fan-out (power of two so slots are head & mask)
+_RING_SIZE = 8
+_RING_MASK = _RING_SIZE - 1
+
 class StreamingOutput:
     """Handles video streaming output for multiple concurrent viewers"""
     
-    def __init__(self):
-        """Initialize streaming output"""
-        self._current_frame_data: Optional[bytes] = None
-        self._frame_lock = threading.RLock()
-        self._viewers: Set[int] = set()
-        self._viewer_lock = threading.RLock()
+    # Unique viewer ids across all streams (thread ids can be reused by short-lived threads/greenlets)
+    _next_viewer_id = itertools.count(1)
+    
+    # Fixed attribute layout: hot per-frame state first, cold encoder/config state after
+    __slots__ = (
+        '_ring', '_head', '_current_frame_data', '_frame_cond', '_active',
+        '_viewer_count', '_frame_lock', '_viewer_lock',
+        '_last_encode_ns', '_min_encode_interval_ns',
+        '_jpeg_quality', '_max_width', '_encode_params', '_tj', '_on_viewers_changed'
+    )
+    
+    def __init__(self, on_viewers_changed: Optional[Callable[[bool], None]] = None):
+        """Initialize streaming output
+        
+        on_viewers_changed is called with True when the first viewer connects and False
+        when the last one leaves, so a producer that runs regardless of viewers can pause.
+        """
+        self._on_viewers_changed = on_viewers_changed
+        self._current_frame_data: Optional[memoryview] = None
+        # Single producer writes _ring[_head & mask] then advances _head; each viewer keeps its own tail
+        self._ring: List[Optional[bytes]] = [None] * _RING_SIZE
+        self._head = 0
+        self._frame_lock = threading.Lock()
+        self._viewer_count = 0  # Viewer identity is never looked up, only counted
+        self._viewer_lock = threading.Lock()
         self._active = True
-        self._frame_ready = threading.Event()
+        # Condition so viewers block until _head advances
+        self._frame_cond = threading.Condition(self._frame_lock)
         
         # Frame encoding settings
         self._jpeg_quality = Config.STREAMING['jpeg_quality']
-        self._encode_params = [cv2.IMWRITE_JPEG_QUALITY, self._jpeg_quality]
+        self._max_width = Config.STREAMING.get('max_width')
+        # Frames arriving faster than fps_limit are dropped before encoding
+        self._min_encode_interval_ns = int(1e9 / Config.STREAMING['fps_limit'])
+        self._last_encode_ns = 0
+        # Baseline JPEG: no Huffman optimization pass, no progressive scans, no restart markers
+        self._encode_params = [
+            cv2.IMWRITE_JPEG_QUALITY, self._jpeg_quality,
+            cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+            cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
+            cv2.IMWRITE_JPEG_RST_INTERVAL, 0
+        ]
+        self._tj = None
+        if TURBOJPEG_AVAILABLE:
+            try:
+                self._tj = TurboJPEG()
+            except Exception as e:
+                logger.warning(f"TurboJPEG unavailable, using OpenCV JPEG encoding: {e}")
         
         logger.info("Simplified streaming output initialized")
     
     def write_frame(self, frame):
-        """Write a new frame to the stream"""
-        if not self._active:
+        """Write a new frame to the stream (software encode path)"""
+        # Nobody watching - skip the encode entirely
+        # Unlocked read of the viewer count: a stale answer only skips or encodes one extra frame
+        if not self._active or not self._viewer_count:
+            return
+        
+        # Producer is outrunning fps_limit - drop this frame before paying for the encode
+        now = time.monotonic_ns()
+        if now - self._last_encode_ns < self._min_encode_interval_ns:
             return
+        self._last_encode_ns = now
         
         try:
+            # Downsample wide frames first - encode cost scales with pixel count
+            if self._max_width and frame.shape[1] > self._max_width:
+                height = int(frame.shape[0] * self._max_width / frame.shape[1])
+                frame = cv2.resize(frame, (self._max_width, height), interpolation=cv2.INTER_AREA)
+            
             # Frame from Picamera2 is in RGB format
             # Encode directly as JPEG without conversion - browsers expect RGB JPEGs
+            # Each optional encoder falls through to the next one if it rejects the frame
+            if SIMPLEJPEG_AVAILABLE and frame.flags.c_contiguous:
+                try:
+                    self._publish(simplejpeg.encode_jpeg(frame, quality=self._jpeg_quality, colorspace='BGR',
+                                                         colorsubsampling='420', fastdct=True))
+                    return
+                except Exception as e:
+                    logger.debug(f"simplejpeg encode failed, trying next encoder: {e}")
+            
+            if self._tj:
+                try:
+                    # Same channel order cv2.imencode assumes, with the fast integer DCT
+                    self._publish(self._tj.encode(frame, quality=self._jpeg_quality, pixel_format=TJPF_BGR,
+                                                  jpeg_subsample=TJSAMP_420, flags=TJFLAG_FASTDCT))
+                    return
+                except Exception as e:
+                    logger.debug(f"TurboJPEG encode failed, using OpenCV: {e}")
+            
             success, buffer = cv2.imencode('.jpg', frame, self._encode_params)
             if success:
-                # Store frame data directly as bytes
-                frame_data = buffer.tobytes()
-                
-                with self._frame_lock:
-                    # Replace current frame data
-                    self._current_frame_data = frame_data
-                    # Frame written successfully
-                
-                # Notify all waiting viewers that a new frame is available
-                self._frame_ready.set()
-                self._frame_ready.clear()
+                # Publish the encode buffer directly - no intermediate tobytes() copy
+                self._publish(buffer)
         
         except Exception as e:
             logger.error(f"Error writing frame to stream: {e}")
     
+    def write(self, buf) -> int:
+        """File-like sink for Picamera2 encoder output, each buffer is one complete JPEG"""
+        if self._active:
+            self._publish(buf)
+        return len(buf)
+    
+    def flush(self):
+        """No-op, frames are published as soon as they are written"""
+        pass
+    
+    def _publish(self, frame_data):
+        """Make encoded JPEG data (any bytes-like object) the current frame and wake viewers"""
+        # Framing is the only copy of the JPEG; the raw frame data is a view into that copy,
+        # so the encoder's buffer can be reused or freed as soon as this returns
+        size = memoryview(frame_data).nbytes
+        framed = _FRAME_TEMPLATE % (size, frame_data)
+        end = len(framed) - 2  # Trailing CRLF
+        
+        # Plain attribute and list stores are atomic, so viewers read these without taking the lock.
+        # The ring slot must be filled before _head announces it.
+        self._current_frame_data = memoryview(framed)[end - size:end]
+        self._ring[self._head & _RING_MASK] = framed
+        
+        # The lock is only needed to wake viewers blocked on the condition
+        with self._frame_cond:
+            self._head += 1
+            self._frame_cond.notify_all()
+    
     def get_stream(self) -> Generator[bytes, None, None]:
         """Get streaming generator for Flask Response with proper multi-user support"""
-        # Wait for first frame to be available
-        timeout = 0
-        while self._current_frame_data is None and timeout < 50:  # 5 second timeout
-            time.sleep(0.1)
-            timeout += 1
-        
-        if self._current_frame_data is None:
-            logger.warning("No frame data available after timeout")
-            return
-        viewer_id = id(threading.current_thread())
+        viewer_id = next(StreamingOutput._next_viewer_id)
         
         # Check viewer limit
         with self._viewer_lock:
-            if len(self._viewers) >= Config.STREAMING['max_viewers']:
+            if self._viewer_count >= Config.STREAMING['max_viewers']:
                 logger.warning(f"Maximum viewers ({Config.STREAMING['max_viewers']}) reached, rejecting new connection")
                 return
-            self._viewers.add(viewer_id)
+            self._viewer_count += 1
+            if self._viewer_count == 1:
+                self._notify_viewers_changed(True)
         
-        logger.info(f"New viewer connected (ID: {viewer_id}), total viewers: {len(self._viewers)}")
+        logger.info(f"New viewer connected (ID: {viewer_id}), total viewers: {self._viewer_count}")
         
         try:
+            # Wait for first frame to be available - encoding only starts once a viewer is registered
+            with self._frame_cond:
+                self._frame_cond.wait_for(
+                    lambda: self._current_frame_data is not None or not self._active, timeout=5.0)
+            
+            if self._current_frame_data is None:
+                logger.warning("No frame data available after timeout")
+                return
+            
             last_frame_data = None
+            tail = self._head - 1  # Start from the latest published frame
             frame_count = 0
             consecutive_empty_frames = 0
             max_empty_frames = 150
+            keepalive_interval = 1.0  # Seconds before the last frame is resent to keep the connection open
+            frame_cond = self._frame_cond
             
             while self._active:
                 try:
-                    # Get current frame data (already stored as bytes)
+                    # Block until a new frame is published or the keepalive interval elapses
+                    if self._head == tail:
+                        with frame_cond:
+                            frame_cond.wait_for(
+                                lambda: self._head != tail or not self._active,
+                                timeout=keepalive_interval)
+                    
+                    # Viewer fell a full ring behind - skip to the latest frame
+                    head = self._head
+                    if head - tail >= _RING_SIZE:
+                        tail = head - 1
+                    
+                    # Lock-free read of the next shared, immutable framed part in the ring
                     frame_data = None
-                    with self._frame_lock:
-                        if self._current_frame_data:
-                            # Frame data is already bytes, just copy reference
-                            frame_data = self._current_frame_data
-                            consecutive_empty_frames = 0
-                        # No frame data check
+                    if tail < head:
+                        frame_data = self._ring[tail & _RING_MASK]
+                        tail += 1
                     
-                    if frame_data and len(frame_data) > 0:
-                        # Send frame using proper MJPEG format
-                        try:
-                            # Send frame in browser-compatible MJPEG format
-                            yield b'--frame\r\n'
-                            yield b'Content-Type: image/jpeg\r\n'
-                            yield b'Content-Length: ' + str(len(frame_data)).encode() + b'\r\n\r\n'
-                            yield frame_data
-                            yield b'\r\n'
-                            frame_count += 1
-                            last_frame_data = frame_data  # Keep last known good frame
-                            # Frame sent successfully
-                            
-                        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
-                            logger.info(f"Viewer {viewer_id} disconnected (broken pipe)")
-                            break
+                    if frame_data:
+                        # Send frame in browser-compatible MJPEG format
+                        yield frame_data
+                        frame_count += 1
+                        consecutive_empty_frames = 0
+                        last_frame_data = frame_data  # Keep last known good frame
                     
                     elif last_frame_data:
-                        # If no new frame but we have a cached frame, send it to prevent timeout
-                        try:
-                            # Send cached frame in browser-compatible MJPEG format
-                            yield b'--frame\r\n'
-                            yield b'Content-Type: image/jpeg\r\n'
-                            yield b'Content-Length: ' + str(len(last_frame_data)).encode() + b'\r\n\r\n'
-                            yield last_frame_data
-                            yield b'\r\n'
-                            frame_count += 1
-                        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
-                            logger.info(f"Viewer {viewer_id} disconnected (broken pipe)")
-                            break
+                        # No new frame within the keepalive interval, resend the cached one to prevent timeout
+                        yield last_frame_data
+                        frame_count += 1
                         
                         consecutive_empty_frames += 1
                         if consecutive_empty_frames >= max_empty_frames:
@@ -139,12 +243,11 @@ class StreamingOutput:
                             logger.warning(f"Viewer {viewer_id} timed out after {max_empty_frames} empty frames")
                             break
                     
-                    # Dynamic frame rate - don't enforce fixed FPS to allow exposure control
-                    # Just a minimal sleep to prevent CPU spinning
-                    time.sleep(0.01)  # 10ms minimal sleep
-                    
                 except GeneratorExit:
                     break
+                except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+                    logger.info(f"Viewer {viewer_id} disconnected (broken pipe)")
+                    break
                 except Exception as e:
                     logger.error(f"Error in streaming generator for viewer {viewer_id}: {e}")
                     break
@@ -152,13 +255,28 @@ class StreamingOutput:
         finally:
             # Remove viewer
             with self._viewer_lock:
-                self._viewers.discard(viewer_id)
-            logger.info(f"Viewer disconnected (ID: {viewer_id}), sent {frame_count} frames, remaining viewers: {len(self._viewers)}")
+                # cleanup() may already have reset the count
+                if self._viewer_count > 0:
+                    self._viewer_count -= 1
+                    if self._viewer_count == 0:
+                        self._notify_viewers_changed(False)
+            logger.info(f"Viewer disconnected (ID: {viewer_id}), sent {frame_count} frames, remaining viewers: {self._viewer_count}")
+    
+    def _notify_viewers_changed(self, watching: bool):
+        """Run the on_viewers_changed hook (called under _viewer_lock so transitions stay ordered)"""
+        if self._on_viewers_changed:
+            try:
+                self._on_viewers_changed(watching)
+            except Exception as e:
+                logger.error(f"Error in viewer change callback: {e}")
+    
+    def get_frame_data(self) -> Optional[memoryview]:
+        """Get the latest published JPEG (a view into its framed part), or None"""
+        return self._current_frame_data
     
     def get_viewer_count(self) -> int:
         """Get current number of viewers"""
-        with self._viewer_lock:
-            return len(self._viewers)
+        return self._viewer_count
     
     def is_active(self) -> bool:
         """Check if streaming is active"""
@@ -166,15 +284,13 @@ class StreamingOutput:
     
     def get_stats(self) -> dict:
         """Get streaming statistics"""
-        with self._viewer_lock:
-            frame_available = self._current_frame_data is not None
-            return {
-                'active': self._active,
-                'viewer_count': len(self._viewers),
-                'frame_available': frame_available,
-                'jpeg_quality': self._jpeg_quality,
-                'fps_limit': Config.STREAMING['fps_limit']
-            }
+        return {
+            'active': self._active,
+            'viewer_count': self._viewer_count,
+            'frame_available': self._current_frame_data is not None,
+            'jpeg_quality': self._jpeg_quality,
+            'fps_limit': Config.STREAMING['fps_limit']
+        }
     
     def cleanup(self):
         """Cleanup streaming resources"""
@@ -182,14 +298,16 @@ class StreamingOutput:
         
         self._active = False
         
-        # Clear current frame data
-        with self._frame_lock:
+        # Clear current frame data and release any waiting viewers
+        with self._frame_cond:
             self._current_frame_data = None
+            self._ring = [None] * _RING_SIZE
+            self._frame_cond.notify_all()
         
         # Clear viewers
         with self._viewer_lock:
-            viewer_count = len(self._viewers)
-            self._viewers.clear()
+            viewer_count = self._viewer_count
+            self._viewer_count = 0
             if viewer_count > 0:
                 logger.info(f"Disconnected {viewer_count} viewers during cleanup")
 
@@ -200,6 +318,7 @@ class MultiStreamingOutput:
     def __init__(self):
         """Initialize multi-streaming output manager"""
         self._streams = {}
+        # Guards writes only - dict reads are atomic, so lookups never wait on create/remove/cleanup
         self._lock = threading.Lock()
         
         logger.info("Multi-streaming output manager initialized")
@@ -218,8 +337,7 @@ class MultiStreamingOutput:
     
     def get_stream(self, stream_id: str) -> Optional[StreamingOutput]:
         """Get existing streaming output"""
-        with self._lock:
-            return self._streams.get(stream_id)
+        return self._streams.get(stream_id)
     
     def remove_stream(self, stream_id: str):
         """Remove streaming output"""
@@ -234,11 +352,11 @@ class MultiStreamingOutput:
     
     def get_all_stats(self) -> dict:
         """Get statistics for all streams"""
-        with self._lock:
-            stats = {}
-            for stream_id, stream in self._streams.items():
-                stats[stream_id] = stream.get_stats()
-            return stats
+        # Snapshot the items so per-stream stats are gathered without holding the lock
+        stats = {}
+        for stream_id, stream in tuple(self._streams.items()):
+            stats[stream_id] = stream.get_stats()
+        return stats
     
     def cleanup(self):
         """Cleanup all streaming outputs"""
@@ -9,9 +9,18 @@ import os
 import sys
 import time
 import threading
-from flask import Flask, Response, jsonify, request
+import cv2
+from concurrent.futures import ThreadPoolExecutor, wait
+from flask import Flask, Response, jsonify, request, send_file
 from config.config import Config
 
+# Optional orjson for faster JSON serialization, falls back to Flask's jsonify
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Setup logging
 logging.basicConfig(
     level=getattr(logging, Config.LOGGING['level']),
@@ -28,69 +37,89 @@ camera_manager = None
 ir_camera = None
 hq_camera = None
 
+def jsonify_fast(obj):
+    """JSON response for the control endpoints, serialized with orjson when available"""
+    if ORJSON_AVAILABLE:
+        return Response(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY), mimetype='application/json')
+    return jsonify(obj)
+
 # Frame capture thread
 frame_capture_thread = None
-frame_capture_running = False
+# Set to stop the capture thread; also wakes it from its inter-frame wait immediately
+frame_capture_stop = threading.Event()
+FRAME_CAPTURE_INTERVAL = 0.5  # 2 frames per second
 
 # Fixed paths for latest frames
-IR_FRAME_PATH = '/home/mark/ufo-tracker/temp/ir_latest.jpg'
-HQ_FRAME_PATH = '/home/mark/ufo-tracker/temp/hq_latest.jpg'
+# Kept on tmpfs (/dev/shm) so twice-a-second snapshots never touch the SD card
+FRAME_DIR = '/dev/shm/ufo-tracker'
+IR_FRAME_PATH = os.path.join(FRAME_DIR, 'ir_latest.jpg')
+HQ_FRAME_PATH = os.path.join(FRAME_DIR, 'hq_latest.jpg')
+
+def _write_latest_frame(camera_obj, frame_path: str) -> bool:
+    """Write the camera's latest JPEG and atomically replace frame_path"""
+    # Reuse the VideoCore encoder's output when it is running - no CPU encode at all
+    buffer = camera_obj.get_encoded_frame()
+    if buffer is None:
+        frame = camera_obj.get_frame()
+        if frame is None:
+            return False
+        
+        success, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, Config.STREAMING.get('jpeg_quality', 85)])
+        if not success:
+            return False
+    
+    # Single write of the encoded bytes to a temp file with .jpg extension
+    temp_path = frame_path.replace('.jpg', '_tmp.jpg')
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, buffer)
+    finally:
+        os.close(fd)
+    
+    # Atomic move to avoid partial reads
+    os.rename(temp_path, frame_path)
+    return True
+
+def _capture_frame(camera_obj, frame_path: str, name: str):
+    """Write one camera's snapshot, logging instead of raising so the other camera is unaffected"""
+    try:
+        if camera_obj and camera_obj.is_active() and _write_latest_frame(camera_obj, frame_path):
+            logger.debug(f"Captured {name} frame")
+    except Exception as e:
+        logger.error(f"Error capturing {name} frame: {e}")
 
 def periodic_frame_capture():
     """Periodically capture frames from cameras and save to temp files"""
-    global frame_capture_running, ir_camera, hq_camera
+    global ir_camera, hq_camera
     
     # Ensure temp directory exists
-    os.makedirs('/home/mark/ufo-tracker/temp', exist_ok=True)
+    os.makedirs(FRAME_DIR, exist_ok=True)
     
     logger.info("Starting periodic frame capture thread")
     
-    import cv2
-    
-    while frame_capture_running:
-        try:
-            # Capture IR frame
-            if ir_camera and ir_camera.is_active():
-                try:
-                    # Capture to a temp file with .jpg extension
-                    temp_ir_path = IR_FRAME_PATH.replace('.jpg', '_tmp.jpg')
-                    ir_camera._camera.capture_file(temp_ir_path)
-                    
-                    # No color conversion needed - Picamera2 output is already correct for web display
-                    
-                    # Atomic move to avoid partial reads
-                    os.rename(temp_ir_path, IR_FRAME_PATH)
-                    logger.debug("Captured IR frame")
-                except Exception as e:
-                    logger.error(f"Error capturing IR frame: {e}")
-            
-            # Capture HQ frame
-            if hq_camera and hq_camera.is_active():
-                try:
-                    # Capture to a temp file with .jpg extension
-                    temp_hq_path = HQ_FRAME_PATH.replace('.jpg', '_tmp.jpg')
-                    hq_camera._camera.capture_file(temp_hq_path)
-                    
-                    # No color conversion needed - Picamera2 output is already correct for web display
-                    
-                    # Atomic move to avoid partial reads
-                    os.rename(temp_hq_path, HQ_FRAME_PATH)
-                    logger.debug("Captured HQ frame")
-                except Exception as e:
-                    logger.error(f"Error capturing HQ frame: {e}")
-            
-            # Wait before next capture - 2 frames per second (0.5 second intervals)
-            time.sleep(0.5)  # Capture 2 frames per second
-            
-        except Exception as e:
-            logger.error(f"Error in periodic frame capture: {e}")
-            time.sleep(1)
+    # IR and HQ snapshots are encoded in parallel (cv2.imencode releases the GIL)
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='frame-capture') as executor:
+        while not frame_capture_stop.is_set():
+            # Deadline is taken before capturing so encode time doesn't stretch the interval
+            deadline = time.monotonic() + FRAME_CAPTURE_INTERVAL
+            try:
+                wait([
+                    executor.submit(_capture_frame, ir_camera, IR_FRAME_PATH, 'IR'),
+                    executor.submit(_capture_frame, hq_camera, HQ_FRAME_PATH, 'HQ')
+                ])
+                
+                # Wait out the rest of the interval, returning early if the thread is stopped
+                frame_capture_stop.wait(max(0.0, deadline - time.monotonic()))
+                
+            except Exception as e:
+                logger.error(f"Error in periodic frame capture: {e}")
+                frame_capture_stop.wait(1)
     
     logger.info("Periodic frame capture thread stopped")
 
 def initialize_cameras():
     """Initialize cameras using auto-detection camera manager"""
-    global camera_manager, ir_camera, hq_camera, frame_capture_thread, frame_capture_running
+    global camera_manager, ir_camera, hq_camera, frame_capture_thread
     
     try:
         from camera.camera_manager import CameraManager
@@ -109,7 +138,7 @@ def initialize_cameras():
         logger.info(f"Camera assignments: IR=index {assignments['ir_camera']['index']}, HQ=index {assignments['hq_camera']['index']}")
         
         # Start periodic frame capture thread
-        frame_capture_running = True
+        frame_capture_stop.clear()
         frame_capture_thread = threading.Thread(target=periodic_frame_capture, daemon=True)
         frame_capture_thread.start()
         logger.info("Started periodic frame capture thread")
@@ -122,10 +151,10 @@ def initialize_cameras():
 
 def cleanup_cameras():
     """Cleanup camera resources"""
-    global camera_manager, ir_camera, hq_camera, frame_capture_running, frame_capture_thread
+    global camera_manager, ir_camera, hq_camera, frame_capture_thread
     
     # Stop frame capture thread
-    frame_capture_running = False
+    frame_capture_stop.set()
     if frame_capture_thread and frame_capture_thread.is_alive():
         frame_capture_thread.join(timeout=2)
         logger.info("Frame capture thread stopped")
@@ -148,7 +177,7 @@ def cleanup_cameras():
 def ir_feed():
     """IR camera MJPEG stream endpoint"""
     if not ir_camera or not ir_camera.is_active():
-        return jsonify({'error': 'IR camera not available'}), 503
+        return jsonify_fast({'error': 'IR camera not available'}), 503
     
     # Use the camera's streaming object directly
     stream = ir_camera.get_stream()
@@ -163,7 +192,7 @@ def ir_feed():
 def hq_feed():
     """HQ camera MJPEG stream endpoint"""
     if not hq_camera or not hq_camera.is_active():
-        return jsonify({'error': 'HQ camera not available'}), 503
+        return jsonify_fast({'error': 'HQ camera not available'}), 503
     
     # Use the camera's streaming object directly
     stream = hq_camera.get_stream()
@@ -174,113 +203,39 @@ def hq_feed():
     response.headers['Access-Control-Allow-Methods'] = 'GET,OPTIONS'
     return response
 
-@app.route('/ir_frame')
-def ir_frame():
-    """Single IR camera frame as JPEG with proper colorspace conversion"""
+def _frame_response(camera_obj, frame_path: str, name: str):
+    """Serve the snapshot periodic_frame_capture() last wrote for this camera"""
     try:
-        if ir_camera and ir_camera.is_active():
-            import tempfile
-            import os
-            import cv2
-            
-            # Create temporary file for capture
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
-                temp_filename = temp_file.name
+        if camera_obj and camera_obj.is_active() and os.path.exists(frame_path):
+            accel_prefix = Config.NETWORK.get('frame_accel_redirect')
+            if accel_prefix:
+                # Fronting nginx serves the file itself via sendfile(); only headers leave Python
+                response = Response(mimetype='image/jpeg')
+                response.headers['X-Accel-Redirect'] = accel_prefix + os.path.basename(frame_path)
+            else:
+                # Already-encoded JPEG sent straight from tmpfs - no capture or encode per request
+                response = send_file(frame_path, mimetype='image/jpeg', conditional=True)
+            response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+            response.headers['Pragma'] = 'no-cache'
+            response.headers['Expires'] = '0'
+            response.headers['Access-Control-Allow-Origin'] = '*'
+            response.headers['Connection'] = 'close'
+            return response
             
-            try:
-                # Capture still image to file
-                ir_camera._camera.capture_file(temp_filename)
-                
-                # Fix colorspace: load, convert, and re-save
-                img = cv2.imread(temp_filename)
-                if img is not None:
-                    # OpenCV loads as BGR, but Picamera2 saved as RGB interpreted as BGR
-                    # So we need to convert BGR->RGB to fix the swapped channels
-                    img_fixed = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                    # Encode to JPEG
-                    success, buffer = cv2.imencode('.jpg', img_fixed, [cv2.IMWRITE_JPEG_QUALITY, 90])
-                    if success:
-                        image_data = buffer.tobytes()
-                    else:
-                        # Fallback to original file if conversion fails
-                        with open(temp_filename, 'rb') as f:
-                            image_data = f.read()
-                else:
-                    # Fallback to original file if loading fails
-                    with open(temp_filename, 'rb') as f:
-                        image_data = f.read()
-                
-                response = Response(image_data, mimetype='image/jpeg')
-                response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-                response.headers['Pragma'] = 'no-cache'
-                response.headers['Expires'] = '0'
-                response.headers['Access-Control-Allow-Origin'] = '*'
-                response.headers['Connection'] = 'close'
-                return response
-                
-            finally:
-                # Clean up temp file
-                if os.path.exists(temp_filename):
-                    os.unlink(temp_filename)
-                    
     except Exception as e:
-        logger.error(f"Error serving IR frame: {e}")
+        logger.error(f"Error serving {name} frame: {e}")
     
-    return Response("IR camera frame not available", status=503, mimetype='text/plain')
+    return Response(f"{name} camera frame not available", status=503, mimetype='text/plain')
+
+@app.route('/ir_frame')
+def ir_frame():
+    """Single IR camera frame as JPEG"""
+    return _frame_response(ir_camera, IR_FRAME_PATH, 'IR')
 
 @app.route('/hq_frame')
 def hq_frame():
-    """Single HQ camera frame as JPEG with proper colorspace conversion"""
-    try:
-        if hq_camera and hq_camera.is_active():
-            import tempfile
-            import os
-            import cv2
-            
-            # Create temporary file for capture
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
-                temp_filename = temp_file.name
-            
-            try:
-                # Capture still image to file
-                hq_camera._camera.capture_file(temp_filename)
-                
-                # Fix colorspace: load, convert, and re-save
-                img = cv2.imread(temp_filename)
-                if img is not None:
-                    # OpenCV loads as BGR, but Picamera2 saved as RGB interpreted as BGR
-                    # So we need to convert BGR->RGB to fix the swapped channels
-                    img_fixed = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                    # Encode to JPEG
-                    success, buffer = cv2.imencode('.jpg', img_fixed, [cv2.IMWRITE_JPEG_QUALITY, 90])
-                    if success:
-                        image_data = buffer.tobytes()
-                    else:
-                        # Fallback to original file if conversion fails
-                        with open(temp_filename, 'rb') as f:
-                            image_data = f.read()
-                else:
-                    # Fallback to original file if loading fails
-                    with open(temp_filename, 'rb') as f:
-                        image_data = f.read()
-                
-                response = Response(image_data, mimetype='image/jpeg')
-                response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-                response.headers['Pragma'] = 'no-cache'
-                response.headers['Expires'] = '0'
-                response.headers['Access-Control-Allow-Origin'] = '*'
-                response.headers['Connection'] = 'close'
-                return response
-                
-            finally:
-                # Clean up temp file
-                if os.path.exists(temp_filename):
-                    os.unlink(temp_filename)
-                    
-    except Exception as e:
-        logger.error(f"Error serving HQ frame: {e}")
-    
-    return Response("HQ camera frame not available", status=503, mimetype='text/plain')
+    """Single HQ camera frame as JPEG"""
+    return _frame_response(hq_camera, HQ_FRAME_PATH, 'HQ')
 
 @app.route('/api/camera_settings/<camera>', methods=['GET', 'POST'])
 def camera_settings(camera):
@@ -294,17 +249,17 @@ def camera_settings(camera):
     elif camera == 'hq' and hq_camera:
         camera_obj = hq_camera
     else:
-        return jsonify({'error': f'Camera {camera} not available'}), 404
+        return jsonify_fast({'error': f'Camera {camera} not available'}), 404
     
     try:
         if request.method == 'GET':
             # Get current settings
             if hasattr(camera_obj, 'get_settings'):
                 settings = camera_obj.get_settings()
-                return jsonify(settings)
+                return jsonify_fast(settings)
             else:
                 # Return default settings if get_settings not implemented
-                return jsonify({
+                return jsonify_fast({
                     'camera': camera,
                     'auto_exposure': True,
                     'exposure_time': 33000,
@@ -317,87 +272,37 @@ def camera_settings(camera):
             # Apply new settings
             data = request.get_json()
             if not data:
-                return jsonify({'error': 'No JSON data provided'}), 400
+                return jsonify_fast({'error': 'No JSON data provided'}), 400
             
-            success_count = 0
-            total_settings = 0
-            applied_settings = {}
-            failed_settings = []
-            
-            # Map frontend setting names to camera method names
-            setting_mapping = {
-                'exposure_time': 'exposure',
-                'auto_exposure': 'auto_exposure',
-                'gain': 'gain',
-                'brightness': 'brightness',
-                'contrast': 'contrast'
-            }
-            
-            # Try batch application first for better camera stability
-            if hasattr(camera_obj, 'apply_settings_batch'):
-                try:
-                    result = camera_obj.apply_settings_batch(data)
-                    if result:
-                        # Batch application successful
-                        success_count = len(data)
-                        total_settings = len(data)
-                        applied_settings = data.copy()
-                        logger.info(f"Applied batch settings to {camera} camera: {data}")
-                    else:
-                        # Fall back to individual settings
-                        raise Exception("Batch application failed")
-                except Exception as e:
-                    logger.warning(f"Batch settings failed for {camera}, falling back to individual: {e}")
-                    # Fall through to individual settings application
+            # One set_controls call for the whole request - per-setting calls each stall the pipeline
+            applied_settings = camera_obj.apply_settings_batch(data)
+            if applied_settings is None:
+                return jsonify_fast({
+                    'success': False,
+                    'error': 'Failed to apply settings',
+                    'failed': list(data)
+                }), 500
             
-            # Individual settings application (fallback or if batch not supported)
-            if success_count == 0:
-                for setting, value in data.items():
-                    total_settings += 1
-                    try:
-                        # Map frontend setting name to camera method name
-                        method_name = setting_mapping.get(setting, setting)
-                        
-                        if hasattr(camera_obj, 'set_' + method_name):
-                            method = getattr(camera_obj, 'set_' + method_name)
-                            result = method(value)
-                            if result is not False:  # Some methods return None for success
-                                applied_settings[setting] = value
-                                success_count += 1
-                                logger.info(f"Applied {camera} {setting}={value}")
-                            else:
-                                failed_settings.append(f"{setting} (method returned False)")
-                        else:
-                            failed_settings.append(f"{setting} (method set_{method_name} not found)")
-                            logger.warning(f"Method set_{method_name} not found for {camera} camera")
-                    except Exception as e:
-                        failed_settings.append(f"{setting} (error: {str(e)})")
-                        logger.error(f"Failed to apply {camera} {setting}={value}: {e}")
+            logger.info(f"Applied batch settings to {camera} camera: {applied_settings}")
             
-            # Return results
-            if success_count == total_settings:
-                return jsonify({
+            # Settings the camera accepted but did not act on, e.g. exposure_time/gain under auto exposure
+            ignored_settings = [setting for setting in data if setting not in applied_settings]
+            if not ignored_settings:
+                return jsonify_fast({
                     'success': True,
-                    'message': f'All settings applied successfully',
+                    'message': 'All settings applied successfully',
                     'applied': applied_settings
                 })
-            elif success_count > 0:
-                return jsonify({
-                    'success': True,
-                    'message': f'Applied {success_count}/{total_settings} settings',
-                    'applied': applied_settings,
-                    'failed': failed_settings
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': f'Failed to apply any settings',
-                    'failed': failed_settings
-                }), 500
+            return jsonify_fast({
+                'success': True,
+                'message': f'Applied {len(applied_settings)}/{len(data)} settings',
+                'applied': applied_settings,
+                'ignored': ignored_settings
+            })
     
     except Exception as e:
         logger.error(f"Error in camera_settings for {camera}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return jsonify_fast({'error': str(e)}), 500
 
 @app.route('/api/camera_dynamic_exposure/<camera>', methods=['POST'])
 def dynamic_exposure(camera):
@@ -411,17 +316,17 @@ def dynamic_exposure(camera):
     elif camera == 'hq' and hq_camera:
         camera_obj = hq_camera
     else:
-        return jsonify({'error': f'Camera {camera} not available'}), 404
+        return jsonify_fast({'error': f'Camera {camera} not available'}), 404
     
     try:
         if hasattr(camera_obj, 'apply_dynamic_exposure'):
             result = camera_obj.apply_dynamic_exposure()
-            return jsonify(result)
+            return jsonify_fast(result)
         else:
-            return jsonify({'error': 'Dynamic exposure not supported for this camera'}), 400
+            return jsonify_fast({'error': 'Dynamic exposure not supported for this camera'}), 400
     except Exception as e:
         logger.error(f"Error applying dynamic exposure for {camera}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return jsonify_fast({'error': str(e)}), 500
 
 @app.route('/api/camera_day_mode/<camera>', methods=['POST'])
 def day_mode(camera):
@@ -435,17 +340,17 @@ def day_mode(camera):
     elif camera == 'hq' and hq_camera:
         camera_obj = hq_camera
     else:
-        return jsonify({'error': f'Camera {camera} not available'}), 404
+        return jsonify_fast({'error': f'Camera {camera} not available'}), 404
     
     try:
         if hasattr(camera_obj, 'set_day_mode'):
             result = camera_obj.set_day_mode()
-            return jsonify(result)
+            return jsonify_fast(result)
         else:
-            return jsonify({'error': 'Day mode not supported for this camera'}), 400
+            return jsonify_fast({'error': 'Day mode not supported for this camera'}), 400
     except Exception as e:
         logger.error(f"Error setting day mode for {camera}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return jsonify_fast({'error': str(e)}), 500
 
 @app.route('/api/camera_night_mode/<camera>', methods=['POST'])
 def night_mode(camera):
@@ -459,17 +364,17 @@ def night_mode(camera):
     elif camera == 'hq' and hq_camera:
         camera_obj = hq_camera
     else:
-        return jsonify({'error': f'Camera {camera} not available'}), 404
+        return jsonify_fast({'error': f'Camera {camera} not available'}), 404
     
     try:
         if hasattr(camera_obj, 'set_night_mode'):
             result = camera_obj.set_night_mode()
-            return jsonify(result)
+            return jsonify_fast(result)
         else:
-            return jsonify({'error': 'Night mode not supported for this camera'}), 400
+            return jsonify_fast({'error': 'Night mode not supported for this camera'}), 400
     except Exception as e:
         logger.error(f"Error setting night mode for {camera}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return jsonify_fast({'error': str(e)}), 500
 
 @app.route('/api/camera_restart_streaming/<camera>', methods=['POST'])
 def restart_streaming(camera):
@@ -483,28 +388,28 @@ def restart_streaming(camera):
     elif camera == 'hq' and hq_camera:
         camera_obj = hq_camera
     else:
-        return jsonify({'error': f'Camera {camera} not available'}), 404
+        return jsonify_fast({'error': f'Camera {camera} not available'}), 404
     
     try:
         if hasattr(camera_obj, 'restart_streaming'):
             result = camera_obj.restart_streaming()
             if result:
-                return jsonify({
+                return jsonify_fast({
                     'success': True,
                     'message': f'{camera.upper()} camera streaming restarted successfully'
                 })
             else:
-                return jsonify({'error': 'Failed to restart streaming'}), 500
+                return jsonify_fast({'error': 'Failed to restart streaming'}), 500
         else:
-            return jsonify({'error': 'Restart streaming not supported for this camera'}), 400
+            return jsonify_fast({'error': 'Restart streaming not supported for this camera'}), 400
     except Exception as e:
         logger.error(f"Error restarting streaming for {camera}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return jsonify_fast({'error': str(e)}), 500
 
 @app.route('/health')
 def health():
     """Health check endpoint"""
-    return jsonify({
+    return jsonify_fast({
         'status': 'ok',
         'service': 'camera-streaming',
         'cameras': {
@@ -22,7 +22,9 @@ class Config:
             'framerate': 30,
             'auto_exposure': True,
             'exposure_time': 10000,  # microseconds
-            'gain': 1.0
+            'gain': 1.0,
+            'luma_stream': False,  # Extra YUV420 lores stream so motion detection reads luma without RGB conversion
+            'encode_on_gpu': None  # Hardware MJPEG encoder for this camera (None = use STREAMING['encode_on_gpu'])
         },
         'hq_camera': {
             'index': 1,  # Camera index for HQ camera
@@ -40,8 +42,12 @@ class Config:
         'min_area': 500,    # Minimum area for motion detection
         'blur_size': 21,    # Gaussian blur size for background subtraction
         'history': 500,     # Background subtractor history
-        'var_threshold': 16, # Background subtractor variance threshold
-        'detect_shadows': True
+        'var_threshold': 16, # Background subtractor variance threshold (MOG2 only)
+        # Shadow detection roughly doubles MOG2/KNN cost and is of no use against a night sky
+        'detect_shadows': False,
+        # 'MOG2' (default), 'KNN', or 'CNT' (opencv-contrib; fastest on ARM, best with a static mount)
+        'bg_algorithm': 'MOG2',
+        'detect_resolution': None  # e.g. (320, 240): detect on a downscaled frame (lores stream size with luma_stream)
     }
     
     # Object Tracking Settings
@@ -49,7 +55,9 @@ class Config:
         'max_disappeared': 30,  # Max frames object can disappear before being deregistered
         'max_distance': 50,     # Max distance between centroids for tracking
         'zoom_factor': 2.0,     # Zoom factor for HQ camera when tracking
-        'track_duration': 10    # Minimum tracking duration in seconds
+        'track_duration': 10,   # Minimum tracking duration in seconds
+        'feature_detector': 'ORB',  # Camera correlation features: 'ORB' (fast, binary) or 'SIFT' (FLANN-matched)
+        'calibration_max_width': 960  # Downscale wider frames before feature detection during calibration
     }
     
     # Pan-Tilt Settings (Placeholder for Waveshare controller)
@@ -68,7 +76,12 @@ class Config:
         'jpeg_quality': 85,     # JPEG compression quality (1-100)
         'buffer_size': 3,       # Frame buffer size
         'max_viewers': 10,      # Maximum concurrent viewers
-        'fps_limit': 30         # FPS limit for streams
+        'fps_limit': 30,        # FPS limit for streams
+        'max_width': 1280,      # Downsample wider frames before JPEG encoding (None = never)
+        # Use the hardware MJPEG encoder instead of cv2.imencode (IR camera only - the HQ ROI zoom is
+        # applied in software). It encodes the full main stream at the camera frame rate, so fps_limit
+        # and max_width only apply to software encoding. Paused while the stream has no viewers.
+        'encode_on_gpu': False
     }
     
     # Storage Settings
@@ -76,7 +89,8 @@ class Config:
         'save_detections': True,    # Save detected objects
         'save_path': 'detections/', # Path to save detections
         'max_storage_gb': 10,       # Maximum storage in GB
-        'cleanup_days': 7           # Delete files older than X days
+        'cleanup_days': 7,          # Delete files older than X days
+        'write_queue_size': 32      # Detection frames buffered for the background writer before dropping
     }
     
     # Logging Settings
@@ -91,7 +105,10 @@ class Config:
     NETWORK = {
         'stream_timeout': 30,       # Stream timeout in seconds
         'connection_timeout': 10,   # Connection timeout in seconds
-        'retry_attempts': 3         # Number of retry attempts
+        'retry_attempts': 3,        # Number of retry attempts
+        # nginx 'internal' location aliased to /dev/shm/ufo-tracker/ (e.g. '/_internal/');
+        # when set, frame endpoints reply with X-Accel-Redirect and nginx sends the file. None = send_file
+        'frame_accel_redirect': None
     }
     
     # ADSB Flight Tracking Settings
@@ -100,6 +117,8 @@ class Config:
         'piaware_url': 'http://10.0.1.249:8080/skyaware/data/aircraft.json',  # Local PiAware SkyAware ADSB feeder
         'max_distance_miles': 5.0,  # Maximum distance for flight display (miles)
         'update_interval': 10,      # Update interval in seconds
+        'json_parser': 'orjson',    # 'orjson' (faster, if installed) or 'json' (requests built-in)
+        'http_session': True,       # Reuse a keep-alive HTTP session for the aircraft.json poll
         'altitude_filter': {
             'min_feet': 0,          # Minimum altitude to display (feet)
             'max_feet': 50000       # Maximum altitude to display (feet)
@@ -122,7 +141,9 @@ class Config:
     # Satellite Tracking Settings
     SATELLITE = {
         'enabled': True,            # Enable satellite tracking
-        'tle_url': 'https://celestrak.org/NORAD/elements/gp.php?GROUP=active&FORMAT=tle',  # CelesTrak TLE data source
+        'tle_url': 'https://celestrak.org/NORAD/elements/gp.php?GROUP=active&FORMAT=json',  # CelesTrak GP data source
+        'tle_format': 'json',       # 'json' (OMM records) or 'tle' (three-line text) - must match FORMAT in tle_url
+        'tle_request_headers': {'Accept-Encoding': 'gzip, deflate'},  # Compressed transfer of the element set
         'min_elevation': 10.0,      # Minimum elevation angle in degrees (0 = horizon)
         'max_satellites': 1000,     # Maximum number of satellites to load (for performance)
         'update_interval': 30,      # Update interval in seconds
@@ -161,6 +182,7 @@ class Config:
         'calibration_samples': 100,  # Number of samples for calibration
         'filter_alpha': 0.8,        # Low-pass filter coefficient (0-1)
         'i2c_address': 0x68,        # I2C address of MPU9250
+        'burst_read': True,         # Read accel/temp/gyro in one 14-byte I2C burst (direct smbus access only)
         'range_settings': {
             'accelerometer': '±4g',  # ±2g, ±4g, ±8g, ±16g
             'gyroscope': '±500°/s',  # ±250°/s, ±500°/s, ±1000°/s, ±2000°/s
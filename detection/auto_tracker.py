@@ -7,6 +7,7 @@ Uses OpenCV feature matching for camera correlation
 import logging
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Any
@@ -17,23 +18,70 @@ from config.config import Config
 
 logger = logging.getLogger(__name__)
 
+
+def _log_opencv_cpu_features():
+    """Log the SIMD baseline/dispatch targets of the installed OpenCV build, warning if there are none"""
+    if not cv2.useOptimized():
+        logger.warning("OpenCV optimized code paths were disabled, re-enabling them")
+        cv2.setUseOptimized(True)
+    
+    features = {}
+    for line in cv2.getBuildInformation().splitlines():
+        key, _, value = line.strip().partition(':')
+        if key in ('Baseline', 'Dispatched code generation'):
+            features[key] = ' '.join(value.split())
+    
+    if features.get('Baseline') or features.get('Dispatched code generation'):
+        logger.info(f"OpenCV {cv2.__version__} SIMD baseline: {features.get('Baseline') or 'none'}; "
+                    f"dispatched: {features.get('Dispatched code generation') or 'none'}")
+    else:
+        logger.warning(f"OpenCV {cv2.__version__} was built without SIMD (NEON/SSE/AVX) support; "
+                       "feature matching and transforms will run scalar code")
+
+
+def _frame_phash(gray: np.ndarray) -> np.ndarray:
+    """64-bit perceptual hash of a grayscale frame as 8 packed bytes"""
+    if hasattr(cv2, 'img_hash'):
+        return cv2.img_hash.pHash(gray).ravel()
+    
+    # Same scheme without opencv-contrib: low 8x8 DCT frequencies of a 32x32 thumbnail vs. their median
+    thumb = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(thumb)[:8, :8]
+    return np.packbits(low > np.median(low))
+
+
 class CameraCorrelation:
     """Handles correlation between IR and HQ cameras using feature matching"""
     
     def __init__(self):
         """Initialize camera correlation system"""
         self.homography_matrix = None
+        # Homography with the IR->HQ resolution scaling folded in, per (hq_resolution, ir_resolution)
+        self._scaled_homographies = {}
         self.correlation_points = []
         self.calibration_valid = False
         self.last_calibration = None
+        # Perceptual hash of the IR frame behind the current homography
+        self._last_calib_phash = None
         
         # Feature detector for correlation
-        self.detector = cv2.SIFT_create()
-        self.matcher = cv2.BFMatcher()
+        self.feature_detector = Config.TRACKING.get('feature_detector', 'ORB').upper()
+        if self.feature_detector == 'SIFT':
+            # SIFT float descriptors matched approximately with FLANN randomized KD-trees;
+            # the ratio test and RANSAC absorb the occasional wrong neighbour
+            self.detector = cv2.SIFT_create()
+            self.matcher = cv2.FlannBasedMatcher(dict(algorithm=1, trees=5), dict(checks=32))
+        else:
+            # Binary ORB descriptors matched by Hamming distance, cross-checked so only
+            # mutual nearest neighbours survive (no ratio test needed)
+            self.detector = cv2.ORB_create(nfeatures=1500, scaleFactor=1.2, nlevels=6)
+            self.matcher = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
         
         # Calibration parameters
         self.min_matches = 10
         self.max_reprojection_error = 3.0
+        # Features are detected on frames no wider than this; a homography needs far fewer pixels
+        self.max_feature_width = Config.TRACKING.get('calibration_max_width', 960)
         
         logger.info("Camera correlation system initialized")
     
@@ -42,11 +90,18 @@ class CameraCorrelation:
         try:
             # Convert frames to grayscale
             ir_gray = cv2.cvtColor(ir_frame, cv2.COLOR_RGB2GRAY) if len(ir_frame.shape) == 3 else ir_frame
+            phash = _frame_phash(ir_gray)
             hq_gray = cv2.cvtColor(hq_frame, cv2.COLOR_RGB2GRAY) if len(hq_frame.shape) == 3 else hq_frame
             
-            # Resize HQ frame to match IR resolution for initial correlation
+            # Detect on a downscaled pair when the IR frame is wide; keypoints are scaled back below
             ir_h, ir_w = ir_gray.shape
-            hq_resized = cv2.resize(hq_gray, (ir_w, ir_h))
+            scale = max(1.0, ir_w / self.max_feature_width)
+            feature_size = (int(ir_w / scale), int(ir_h / scale))
+            if scale > 1.0:
+                ir_gray = cv2.resize(ir_gray, feature_size, interpolation=cv2.INTER_AREA)
+            
+            # Resize HQ frame to match the (detection-sized) IR resolution for initial correlation
+            hq_resized = cv2.resize(hq_gray, feature_size, interpolation=cv2.INTER_AREA)
             
             # Detect keypoints and descriptors
             kp1, desc1 = self.detector.detectAndCompute(ir_gray, None)
@@ -56,31 +111,48 @@ class CameraCorrelation:
                 logger.warning("No features detected for camera correlation")
                 return False
             
-            # Match features
-            matches = self.matcher.knnMatch(desc1, desc2, k=2)
-            
-            # Apply Lowe's ratio test
-            good_matches = []
-            for match_pair in matches:
-                if len(match_pair) == 2:
-                    m, n = match_pair
-                    if m.distance < 0.7 * n.distance:
-                        good_matches.append(m)
+            if self.feature_detector == 'SIFT':
+                # Match features
+                matches = self.matcher.knnMatch(desc1, desc2, k=2)
+                
+                # Apply Lowe's ratio test over all pairs at once; incomplete pairs always fail
+                distances = np.array([(mp[0].distance, mp[1].distance) if len(mp) == 2 else (np.inf, 0)
+                                      for mp in matches], dtype=np.float32).reshape(-1, 2)
+                keep = distances[:, 0] < 0.7 * distances[:, 1]
+                good_matches = [matches[i][0] for i in np.flatnonzero(keep)]
+            else:
+                # Match features and keep the closest mutual matches for RANSAC
+                matches = sorted(self.matcher.match(desc1, desc2), key=lambda m: m.distance)
+                good_matches = matches[:max(self.min_matches * 4, 200)]
             
             if len(good_matches) < self.min_matches:
                 logger.warning(f"Insufficient matches for correlation: {len(good_matches)}")
                 return False
             
-            # Extract point correspondences
-            src_pts = np.float32([kp1[m.queryIdx].pt for m in good_matches]).reshape(-1, 1, 2)
-            dst_pts = np.float32([kp2[m.trainIdx].pt for m in good_matches]).reshape(-1, 1, 2)
-            
-            # Calculate homography with RANSAC
-            self.homography_matrix, mask = cv2.findHomography(
-                src_pts, dst_pts, 
-                cv2.RANSAC, 
-                self.max_reprojection_error
-            )
+            # Extract point correspondences by index into the keypoint coordinate arrays,
+            # back in full IR resolution coordinates
+            count = len(good_matches)
+            query_idx = np.fromiter((m.queryIdx for m in good_matches), dtype=np.int32, count=count)
+            train_idx = np.fromiter((m.trainIdx for m in good_matches), dtype=np.int32, count=count)
+            src_pts = cv2.KeyPoint_convert(kp1)[query_idx].reshape(-1, 1, 2) * scale
+            dst_pts = cv2.KeyPoint_convert(kp2)[train_idx].reshape(-1, 1, 2) * scale
+            
+            # Calculate homography with MAGSAC++ where this OpenCV build has it (4.5+), else classic RANSAC
+            self._scaled_homographies = {}
+            if hasattr(cv2, 'USAC_MAGSAC'):
+                self.homography_matrix, mask = cv2.findHomography(
+                    src_pts, dst_pts,
+                    cv2.USAC_MAGSAC,
+                    self.max_reprojection_error,
+                    confidence=0.995,
+                    maxIters=2000
+                )
+            else:
+                self.homography_matrix, mask = cv2.findHomography(
+                    src_pts, dst_pts, 
+                    cv2.RANSAC, 
+                    self.max_reprojection_error
+                )
             
             if self.homography_matrix is not None:
                 # Count inliers
@@ -90,6 +162,7 @@ class CameraCorrelation:
                 if inlier_ratio > 0.3:  # At least 30% inliers
                     self.calibration_valid = True
                     self.last_calibration = datetime.now()
+                    self._last_calib_phash = phash
                     self.correlation_points = [(src_pts[i][0], dst_pts[i][0]) 
                                              for i in range(len(mask)) if mask[i]]
                     
@@ -103,69 +176,103 @@ class CameraCorrelation:
             logger.error(f"Error calibrating camera correlation: {e}")
             return False
     
+    def apply_calibration(self, homography_matrix: np.ndarray, correlation_points: List, phash: np.ndarray):
+        """Adopt a homography calculated elsewhere (e.g. by the auto calibration worker thread)"""
+        self._scaled_homographies = {}
+        self.homography_matrix = homography_matrix
+        self.correlation_points = correlation_points
+        self._last_calib_phash = phash
+        self.calibration_valid = True
+        self.last_calibration = datetime.now()
+    
+    def refresh_if_unchanged(self, ir_frame: np.ndarray) -> bool:
+        """Keep the current homography, resetting its age, if the IR scene has not meaningfully changed since it was calculated"""
+        if not self.calibration_valid or self._last_calib_phash is None:
+            return False
+        
+        ir_gray = cv2.cvtColor(ir_frame, cv2.COLOR_RGB2GRAY) if len(ir_frame.shape) == 3 else ir_frame
+        if np.unpackbits(_frame_phash(ir_gray) ^ self._last_calib_phash).sum() >= 4:
+            return False
+        
+        self.last_calibration = datetime.now()
+        return True
+    
+    def get_scaled_homography(self, hq_resolution: Tuple[int, int], ir_resolution: Tuple[int, int]) -> np.ndarray:
+        """Homography mapping IR pixels straight to full-resolution HQ pixels, cached per resolution pair"""
+        key = (tuple(hq_resolution), tuple(ir_resolution))
+        scaled = self._scaled_homographies.get(key)
+        if scaled is None:
+            # Homography was calculated for the HQ frame resized to IR resolution; S @ H adds the upscale
+            ir_w, ir_h = ir_resolution  # Use actual IR camera streaming resolution
+            hq_w, hq_h = hq_resolution
+            scaled = np.diag([hq_w / ir_w, hq_h / ir_h, 1.0]) @ self.homography_matrix
+            self._scaled_homographies[key] = scaled
+        return scaled
+    
+    def _map_ir_points(self, points: np.ndarray, hq_resolution: Tuple[int, int],
+                       ir_resolution: Tuple[int, int]) -> np.ndarray:
+        """Map an (N, 1, 2) float32 array of IR points to clamped integer HQ pixel coordinates (N, 2)"""
+        # Apply the scaled homography to all points in one call
+        homography = self.get_scaled_homography(hq_resolution, ir_resolution)
+        transformed = cv2.perspectiveTransform(points, homography)[:, 0, :]
+        
+        # Clamp to HQ frame bounds
+        hq_w, hq_h = hq_resolution
+        return np.clip(transformed, 0, [hq_w - 1, hq_h - 1]).astype(np.int32)
+    
     def map_ir_to_hq(self, ir_point: Tuple[int, int], hq_resolution: Tuple[int, int], ir_resolution: Tuple[int, int] = (1280, 720)) -> Optional[Tuple[int, int]]:
         """Map a point from IR camera space to HQ camera space"""
         if not self.calibration_valid or self.homography_matrix is None:
             return None
         
         try:
-            # Convert point to homogeneous coordinates
             point = np.array([[ir_point]], dtype=np.float32)
-            
-            # Apply homography transformation
-            transformed = cv2.perspectiveTransform(point, self.homography_matrix)
-            
-            # Extract coordinates
-            x, y = transformed[0][0]
-            
-            # Scale to HQ camera resolution (homography was calculated for resized HQ frame)
-            ir_w, ir_h = ir_resolution  # Use actual IR camera streaming resolution
-            hq_w, hq_h = hq_resolution
-            
-            # Scale coordinates to full HQ resolution
-            scaled_x = int(x * hq_w / ir_w)
-            scaled_y = int(y * hq_h / ir_h)
-            
-            # Clamp to HQ frame bounds
-            scaled_x = max(0, min(scaled_x, hq_w - 1))
-            scaled_y = max(0, min(scaled_y, hq_h - 1))
-            
-            return (scaled_x, scaled_y)
+            scaled_x, scaled_y = self._map_ir_points(point, hq_resolution, ir_resolution)[0]
+            return (int(scaled_x), int(scaled_y))
             
         except Exception as e:
             logger.error(f"Error mapping IR point to HQ: {e}")
             return None
     
+    def map_ir_points_to_hq(self, ir_points: np.ndarray, hq_resolution: Tuple[int, int], ir_resolution: Tuple[int, int] = (1280, 720)) -> Optional[np.ndarray]:
+        """Map an (N, 2) array of IR points to HQ camera space as an (N, 2) int32 array"""
+        if not self.calibration_valid or self.homography_matrix is None:
+            return None
+        
+        try:
+            points = np.asarray(ir_points, dtype=np.float32).reshape(-1, 1, 2)
+            return self._map_ir_points(points, hq_resolution, ir_resolution)
+        
+        except Exception as e:
+            logger.error(f"Error mapping IR points to HQ: {e}")
+            return None
+        
     def map_ir_bbox_to_hq(self, ir_bbox: Tuple[int, int, int, int], hq_resolution: Tuple[int, int], ir_resolution: Tuple[int, int] = (1280, 720)) -> Optional[Tuple[int, int, int, int]]:
         """Map a bounding box from IR camera space to HQ camera space"""
-        if not self.calibration_valid:
+        if not self.calibration_valid or self.homography_matrix is None:
             return None
         
         x, y, w, h = ir_bbox
         
-        # Map all four corners
-        corners = [
-            (x, y),           # Top-left
-            (x + w, y),       # Top-right  
-            (x, y + h),       # Bottom-left
-            (x + w, y + h)    # Bottom-right
-        ]
-        
-        mapped_corners = []
-        for corner in corners:
-            mapped = self.map_ir_to_hq(corner, hq_resolution, ir_resolution)
-            if mapped is None:
-                return None
-            mapped_corners.append(mapped)
+        # Map all four corners in a single transform
+        corners = np.array([
+            [[x, y]],           # Top-left
+            [[x + w, y]],       # Top-right
+            [[x, y + h]],       # Bottom-left
+            [[x + w, y + h]]    # Bottom-right
+        ], dtype=np.float32)
         
-        # Find bounding rectangle of mapped corners
-        xs = [p[0] for p in mapped_corners]
-        ys = [p[1] for p in mapped_corners]
+        try:
+            mapped_corners = self._map_ir_points(corners, hq_resolution, ir_resolution)
+        except Exception as e:
+            logger.error(f"Error mapping IR bbox to HQ: {e}")
+            return None
         
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
+        # Find bounding rectangle of mapped corners
+        min_x, min_y = mapped_corners.min(axis=0)
+        max_x, max_y = mapped_corners.max(axis=0)
         
-        return (min_x, min_y, max_x - min_x, max_y - min_y)
+        return (int(min_x), int(min_y), int(max_x - min_x), int(max_y - min_y))
     
     def is_calibrated(self) -> bool:
         """Check if cameras are calibrated"""
@@ -186,11 +293,14 @@ class SmoothROIController:
         self.hq_camera = hq_camera
         self.target_roi = None
         self.current_roi = None
+        # Last integer ROI sent to the camera (None = full view), so repeated writes are skipped
+        self._last_written_roi = None
         self.transition_speed = 0.3  # Interpolation factor (0.1 = slow, 1.0 = instant)
         self.min_roi_size = (200, 200)  # Minimum ROI size
         self.roi_padding = 100  # Padding around detected object
         
-        self._lock = threading.Lock()
+        # Guards ROI state; notified whenever the target changes or the controller stops
+        self._cond = threading.Condition()
         self._active = False
         self._transition_thread = None
         
@@ -198,7 +308,7 @@ class SmoothROIController:
     
     def start(self):
         """Start smooth ROI transitions"""
-        with self._lock:
+        with self._cond:
             if self._active:
                 return
             
@@ -210,20 +320,24 @@ class SmoothROIController:
     
     def stop(self):
         """Stop smooth ROI transitions"""
-        with self._lock:
+        with self._cond:
             if not self._active:
                 return
             
             self._active = False
-            
-            if self._transition_thread and self._transition_thread.is_alive():
-                self._transition_thread.join(timeout=1.0)
-            
-            # Reset camera ROI
-            if self.hq_camera:
-                self.hq_camera.reset_roi()
-            
-            logger.info("Smooth ROI controller stopped")
+            self._cond.notify_all()
+        
+        # Join outside the condition so the waking thread can reacquire it and exit
+        if self._transition_thread and self._transition_thread.is_alive():
+            self._transition_thread.join(timeout=1.0)
+        
+        # Reset camera ROI
+        if self.hq_camera:
+            self.hq_camera.reset_roi()
+        self.current_roi = None
+        self._last_written_roi = None
+        
+        logger.info("Smooth ROI controller stopped")
     
     def set_target_roi(self, bbox: Tuple[int, int, int, int], hq_resolution: Tuple[int, int]):
         """Set target ROI with padding"""
@@ -247,13 +361,15 @@ class SmoothROIController:
             padded_y = max(0, padded_y - expand)
             padded_h = min(hq_h - padded_y, self.min_roi_size[1])
         
-        with self._lock:
-            self.target_roi = (padded_x, padded_y, padded_w, padded_h)
+        with self._cond:
+            self.target_roi = np.array([padded_x, padded_y, padded_w, padded_h], dtype=np.float32)
+            self._cond.notify_all()
     
     def reset_roi(self):
         """Reset to full view"""
-        with self._lock:
+        with self._cond:
             self.target_roi = None
+            self._cond.notify_all()
     
     def _transition_loop(self):
         """Main transition loop"""
@@ -261,39 +377,43 @@ class SmoothROIController:
         
         while self._active:
             try:
-                with self._lock:
+                with self._cond:
                     target = self.target_roi
                 
                 if target is None:
                     # Transition to full view
                     if self.current_roi is not None:
                         self.current_roi = None
-                        if self.hq_camera:
+                        if self.hq_camera and self._last_written_roi is not None:
                             self.hq_camera.reset_roi()
+                            self._last_written_roi = None
                 else:
                     # Transition to target ROI
                     if self.current_roi is None:
                         # First target, set immediately
-                        self.current_roi = target
-                        if self.hq_camera:
-                            self.hq_camera.set_roi(*target)
+                        self.current_roi = target.copy()
                     else:
-                        # Smooth transition
-                        current = self.current_roi
-                        
-                        # Interpolate between current and target
-                        new_x = int(current[0] + (target[0] - current[0]) * self.transition_speed)
-                        new_y = int(current[1] + (target[1] - current[1]) * self.transition_speed)
-                        new_w = int(current[2] + (target[2] - current[2]) * self.transition_speed)
-                        new_h = int(current[3] + (target[3] - current[3]) * self.transition_speed)
+                        # Smooth transition: interpolate (x, y, w, h) between current and target
+                        new_roi = self.current_roi + (target - self.current_roi) * self.transition_speed
                         
-                        self.current_roi = (new_x, new_y, new_w, new_h)
+                        # Snap once within a pixel so the transition actually finishes
+                        if np.max(np.abs(target - new_roi)) < 1.0:
+                            new_roi = target.copy()
                         
-                        if self.hq_camera:
-                            self.hq_camera.set_roi(new_x, new_y, new_w, new_h)
+                        self.current_roi = new_roi
+                    
+                    # Rounding often leaves the integer ROI unchanged between steps
+                    new_roi = tuple(np.rint(self.current_roi).astype(np.int32).tolist())
+                    if self.hq_camera and new_roi != self._last_written_roi:
+                        self.hq_camera.set_roi(*new_roi)
+                        self._last_written_roi = new_roi
                 
-                # Control transition rate to match camera performance
-                time.sleep(1.0 / 2)  # 2 FPS transitions to match camera capability
+                # Step again in 0.5 s (2 FPS to match camera capability) while still moving;
+                # otherwise sleep until a new target, a reset or stop() is signalled
+                transitioning = target is not None and not np.array_equal(self.current_roi, target)
+                with self._cond:
+                    if self._active and self.target_roi is target:
+                        self._cond.wait(timeout=0.5 if transitioning else None)
                 
             except Exception as e:
                 logger.error(f"Error in ROI transition loop: {e}")
@@ -310,6 +430,9 @@ class AutoTracker:
         self.camera_manager = camera_manager
         self.motion_detector = motion_detector  # Can be None if motion detection is disabled
         
+        # Report which SIMD paths OpenCV will use for feature detection and matching
+        _log_opencv_cpu_features()
+        
         # Core components
         self.camera_correlation = CameraCorrelation()
         self.roi_controller = SmoothROIController(camera_manager.hq_camera if camera_manager else None)
@@ -323,12 +446,25 @@ class AutoTracker:
         self.auto_calibration_enabled = False
         self.calibration_interval = 300  # Recalibrate every 5 minutes
         self.last_auto_calibration = None
+        # Auto calibration runs on a worker thread so feature matching never stalls the tracking loop
+        # (OpenCV releases the GIL while detecting and matching); the pool is created on first use.
+        # The worker calibrates its own CameraCorrelation, adopted by the tracking loop once done
+        self._calib_pool = None
+        self._calib_future = None
+        self._calib_correlation = None
+        # Serializes changes to the live homography between manual calibration and adopting worker results
+        self._calib_lock = threading.Lock()
         
         # Tracking parameters
         self.tracking_enabled = True  # Enable by default
         self.target_selection_mode = 'largest'  # 'largest', 'newest', 'most_active'
         self.tracking_timeout = 5.0  # Seconds without detection before resetting
         self.last_detection_time = None
+        # IR bbox last sent to the ROI controller, so an unmoved target is not re-mapped
+        self._last_ir_bbox = None
+        # Camera resolutions don't change at runtime; read once in start()
+        self._hq_resolution = (4056, 3040)
+        self._ir_resolution = (1280, 720)
         
         # Statistics
         self.tracks_followed = 0
@@ -345,6 +481,12 @@ class AutoTracker:
                 return True
             
             try:
+                if self.camera_manager:
+                    if self.camera_manager.hq_camera:
+                        self._hq_resolution = tuple(self.camera_manager.hq_camera.resolution)
+                    if self.camera_manager.ir_camera:
+                        self._ir_resolution = tuple(self.camera_manager.ir_camera.resolution)
+                
                 self._running = True
                 self.roi_controller.start()
                 
@@ -373,6 +515,11 @@ class AutoTracker:
             
             self.roi_controller.stop()
             
+            if self._calib_pool:
+                self._calib_pool.shutdown(wait=False, cancel_futures=True)
+                self._calib_pool = None
+                self._calib_future = None
+            
             logger.info("Auto tracking system stopped")
     
     def enable_tracking(self, enabled: bool = True):
@@ -380,6 +527,7 @@ class AutoTracker:
         self.tracking_enabled = enabled
         if not enabled:
             self.roi_controller.reset_roi()
+            self._last_ir_bbox = None
         logger.info(f"Auto tracking {'enabled' if enabled else 'disabled'}")
     
     def calibrate_cameras(self) -> bool:
@@ -389,16 +537,20 @@ class AutoTracker:
             return False
         
         try:
-            # Get frames from both cameras
-            ir_frame = self.camera_manager.get_frame_ir()
-            hq_frame = self.camera_manager.get_frame_hq()
+            ir_frame, hq_frame = self._get_calibration_frames()
             
             if ir_frame is None or hq_frame is None:
                 logger.error("Could not get frames for calibration")
                 return False
             
             self.calibration_attempts += 1
-            success = self.camera_correlation.calibrate_cameras(ir_frame, hq_frame)
+            with self._calib_lock:
+                success = self.camera_correlation.calibrate_cameras(ir_frame, hq_frame)
+                if success:
+                    # An auto calibration still in flight was started from older frames; drop its result
+                    self._calib_future = None
+                    # The tracked target's HQ ROI came from the old homography; re-map it next tick
+                    self._last_ir_bbox = None
             
             if success:
                 self.successful_calibrations += 1
@@ -412,6 +564,73 @@ class AutoTracker:
             logger.error(f"Error during manual calibration: {e}")
             return False
     
+    def _get_calibration_frames(self):
+        """Get an (IR, HQ) frame pair for calibration"""
+        # The IR luma plane, when available, needs no grayscale conversion
+        ir_frame = self.camera_manager.get_frame_ir_gray()
+        if ir_frame is None:
+            ir_frame = self.camera_manager.get_frame_ir()
+        return ir_frame, self.camera_manager.get_frame_hq()
+    
+    def _calibrate_in_worker(self, ir_frame: np.ndarray, hq_frame: np.ndarray):
+        """Run feature-matching calibration on the worker thread; returns (homography, correlation_points, phash) or None"""
+        if self._calib_correlation is None:
+            self._calib_correlation = CameraCorrelation()
+        
+        correlation = self._calib_correlation
+        if not correlation.calibrate_cameras(ir_frame, hq_frame):
+            return None
+        return correlation.homography_matrix, correlation.correlation_points, correlation._last_calib_phash
+    
+    def _submit_calibration(self) -> bool:
+        """Send the current frame pair to the calibration worker thread"""
+        if not self.camera_manager:
+            return False
+        
+        ir_frame, hq_frame = self._get_calibration_frames()
+        if ir_frame is None or hq_frame is None:
+            logger.error("Could not get frames for calibration")
+            return False
+        
+        # Keep the live homography when the IR scene has not meaningfully changed since it was calculated
+        with self._calib_lock:
+            unchanged = self.camera_correlation.refresh_if_unchanged(ir_frame)
+        if unchanged:
+            logger.info("IR scene unchanged since last calibration, keeping current homography")
+            return False
+        
+        if self._calib_pool is None:
+            self._calib_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='calibration')
+        
+        self.calibration_attempts += 1
+        self._calib_future = self._calib_pool.submit(self._calibrate_in_worker, ir_frame, hq_frame)
+        return True
+    
+    def _collect_calibration(self):
+        """Adopt the result of a finished calibration worker, if any"""
+        with self._calib_lock:
+            # Cleared by a manual calibration that succeeded in the meantime
+            future, self._calib_future = self._calib_future, None
+            if future is None:
+                return
+            
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Error during auto calibration: {e}")
+                return
+            
+            if result is None:
+                logger.warning("Auto camera calibration failed")
+                return
+            
+            self.camera_correlation.apply_calibration(*result)
+            # The tracked target's HQ ROI came from the old homography; re-map it next tick
+            self._last_ir_bbox = None
+        
+        self.successful_calibrations += 1
+        logger.info("Auto camera calibration successful")
+    
     def _tracking_loop(self):
         """Main auto tracking loop"""
         logger.info("Auto tracking loop started")
@@ -437,6 +656,12 @@ class AutoTracker:
     
     def _check_auto_calibration(self):
         """Check if auto calibration is needed"""
+        # A calibration is already running in the worker; pick up its result once it is done
+        if self._calib_future is not None:
+            if self._calib_future.done():
+                self._collect_calibration()
+            return
+        
         calibration_age = self.camera_correlation.get_calibration_age()
         
         # Calibrate if needed
@@ -448,7 +673,7 @@ class AutoTracker:
                 
                 logger.info("Performing auto calibration")
                 self.last_auto_calibration = datetime.now()
-                self.calibrate_cameras()
+                self._submit_calibration()
     
     def _process_tracking(self):
         """Process motion detection and update HQ camera tracking"""
@@ -465,16 +690,21 @@ class AutoTracker:
             target_detection = self._select_target_detection(detections)
             
             if target_detection:
+                # Nothing to do while the target has not moved since the last tick
+                ir_bbox = tuple(target_detection['bbox'])
+                if ir_bbox == self._last_ir_bbox:
+                    return
+                
                 # Map IR detection to HQ camera coordinates
-                ir_bbox = target_detection['bbox']
-                hq_resolution = self.camera_manager.hq_camera.resolution if self.camera_manager.hq_camera else (4056, 3040)
-                ir_resolution = self.camera_manager.ir_camera.resolution if self.camera_manager.ir_camera else (1280, 720)
+                hq_resolution = self._hq_resolution
+                ir_resolution = self._ir_resolution
                 
                 hq_bbox = self.camera_correlation.map_ir_bbox_to_hq(ir_bbox, hq_resolution, ir_resolution)
                 
                 if hq_bbox:
                     # Set smooth ROI target
                     self.roi_controller.set_target_roi(hq_bbox, hq_resolution)
+                    self._last_ir_bbox = ir_bbox
                     self.tracks_followed += 1
                     
                     logger.debug(f"Tracking object: IR bbox {ir_bbox} -> HQ bbox {hq_bbox}")
@@ -486,6 +716,7 @@ class AutoTracker:
                 # No detections for too long, reset to full view
                 self.roi_controller.reset_roi()
                 self.last_detection_time = None
+                self._last_ir_bbox = None
                 logger.debug("Tracking timeout, reset to full view")
     
     def _select_target_detection(self, detections: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
@@ -10,6 +10,7 @@ import time
 import cv2
 import numpy as np
 import os
+import queue
 import shutil
 from typing import List, Tuple, Optional, Dict, Any
 from datetime import datetime
@@ -31,6 +32,10 @@ class MotionDetector:
         self.min_area = Config.MOTION_DETECTION['min_area']
         self.blur_size = Config.MOTION_DETECTION['blur_size']
         
+        # Optional reduced resolution for detection; results are reported in IR frame coordinates
+        self.detect_resolution = Config.MOTION_DETECTION.get('detect_resolution')
+        self.frame_resolution = Config.CAMERA_SETTINGS['ir_camera']['resolution']
+        
         # Detection frame storage
         self.detections_dir = "/home/mark/ufo-tracker/detections"
         self.max_disk_usage = 0.9  # Keep disk usage below 90%
@@ -40,18 +45,18 @@ class MotionDetector:
         os.makedirs(self.detections_dir, exist_ok=True)
         
         # Background subtractor
-        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-            history=Config.MOTION_DETECTION['history'],
-            varThreshold=Config.MOTION_DETECTION['var_threshold'],
-            detectShadows=Config.MOTION_DETECTION['detect_shadows']
-        )
+        self.bg_subtractor = self._create_bg_subtractor()
         
         # Detection state
         self._running = False
         self._detection_thread: Optional[threading.Thread] = None
         self._cleanup_thread: Optional[threading.Thread] = None
+        self._writer_thread: Optional[threading.Thread] = None
         self._lock = threading.Lock()
         
+        # Detection frames are annotated, encoded and written off the detection thread
+        self._save_queue: queue.Queue = queue.Queue(maxsize=Config.STORAGE.get('write_queue_size', 32))
+        
         # Detection results
         self._current_detections: List[Dict[str, Any]] = []
         self._detection_count = 0
@@ -64,6 +69,31 @@ class MotionDetector:
         
         logger.info("Motion detector initialized with frame saving")
     
+    def _create_bg_subtractor(self):
+        """Create the configured background subtractor (MOG2, KNN or CNT)"""
+        settings = Config.MOTION_DETECTION
+        algorithm = settings.get('bg_algorithm', 'MOG2').upper()
+        
+        if algorithm == 'CNT':
+            # CNT lives in opencv-contrib's bgsegm module
+            if hasattr(cv2, 'bgsegm'):
+                return cv2.bgsegm.createBackgroundSubtractorCNT(
+                    minPixelStability=settings.get('cnt_min_pixel_stability', 15),
+                    useHistory=True
+                )
+            logger.warning("CNT background subtractor needs opencv-contrib-python, using MOG2")
+        elif algorithm == 'KNN':
+            return cv2.createBackgroundSubtractorKNN(
+                history=settings['history'],
+                detectShadows=settings['detect_shadows']
+            )
+        
+        return cv2.createBackgroundSubtractorMOG2(
+            history=settings['history'],
+            varThreshold=settings['var_threshold'],
+            detectShadows=settings['detect_shadows']
+        )
+    
     def start(self):
         """Start motion detection"""
         with self._lock:
@@ -85,6 +115,10 @@ class MotionDetector:
                 self._cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
                 self._cleanup_thread.start()
                 
+                # Start writer thread for detection frames
+                self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+                self._writer_thread.start()
+                
                 logger.info("Motion detection started with frame saving")
                 return True
                 
@@ -107,6 +141,9 @@ class MotionDetector:
             if self._cleanup_thread and self._cleanup_thread.is_alive():
                 self._cleanup_thread.join(timeout=5.0)
             
+            if self._writer_thread and self._writer_thread.is_alive():
+                self._writer_thread.join(timeout=5.0)
+            
             logger.info("Motion detection stopped")
     
     def _detection_loop(self):
@@ -115,8 +152,10 @@ class MotionDetector:
         
         while self._running:
             try:
-                # Get frame from IR camera
-                frame = self.ir_camera.get_frame()
+                # Get frame from IR camera - luma plane when the lores stream is enabled, no RGB copy
+                frame = self.ir_camera.get_luma_frame()
+                if frame is None:
+                    frame = self.ir_camera.get_frame()
                 if frame is None:
                     time.sleep(0.1)
                     continue
@@ -135,7 +174,9 @@ class MotionDetector:
                         
                         # Save detection frame only if configured
                         if Config.STORAGE.get('save_detections', False):
-                            self._save_detection_frame(frame, detections)
+                            # Saved detections keep colour even when detecting on the luma plane
+                            save_frame = self.ir_camera.get_frame() if len(frame.shape) == 2 else frame
+                            self._queue_detection_frame(save_frame if save_frame is not None else frame, detections)
                 
                 # Control processing rate to match IR camera framerate
                 time.sleep(1.0 / Config.CAMERA_SETTINGS['ir_camera']['framerate'])  # Match camera FPS
@@ -151,11 +192,22 @@ class MotionDetector:
         detections = []
         
         try:
-            # Convert to grayscale (camera provides RGB format)
-            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+            # Convert to grayscale (camera provides RGB format) unless already given the luma plane
+            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY) if len(frame.shape) == 3 else frame
+            
+            # Downsample to the detection resolution unless the lores stream already delivers it
+            if self.detect_resolution and gray.shape[1] > self.detect_resolution[0]:
+                gray = cv2.resize(gray, self.detect_resolution, interpolation=cv2.INTER_AREA)
+            
+            # Scale factors from detection pixels back to IR frame pixels
+            scale_x = self.frame_resolution[0] / gray.shape[1]
+            scale_y = self.frame_resolution[1] / gray.shape[0]
+            
+            # Blur kernel shrinks with the image so it covers the same scene area (kept odd)
+            blur_size = max(3, int(self.blur_size / scale_x) | 1)
             
             # Apply Gaussian blur to reduce noise
-            blurred = cv2.GaussianBlur(gray, (self.blur_size, self.blur_size), 0)
+            blurred = cv2.GaussianBlur(gray, (blur_size, blur_size), 0)
             
             # Apply background subtraction
             fg_mask = self.bg_subtractor.apply(blurred)
@@ -170,12 +222,14 @@ class MotionDetector:
             
             # Process contours
             for contour in contours:
-                area = cv2.contourArea(contour)
+                area = cv2.contourArea(contour) * scale_x * scale_y
                 
                 # Filter by minimum area
                 if area >= self.min_area:
-                    # Get bounding box
+                    # Get bounding box, mapped back to IR frame coordinates
                     x, y, w, h = cv2.boundingRect(contour)
+                    x, y = int(x * scale_x), int(y * scale_y)
+                    w, h = int(w * scale_x), int(h * scale_y)
                     
                     # Calculate centroid
                     cx = x + w // 2
@@ -295,11 +349,35 @@ class MotionDetector:
         logger.info("Cleaning up motion detector...")
         self.stop()
     
-    def _save_detection_frame(self, frame: np.ndarray, detections: List[Dict[str, Any]]):
+    def _queue_detection_frame(self, frame: np.ndarray, detections: List[Dict[str, Any]]):
+        """Hand a detection frame to the writer thread without blocking detection"""
+        try:
+            self._save_queue.put_nowait((frame, detections, datetime.now()))
+        except queue.Full:
+            logger.warning("Detection frame writer is behind, dropping frame")
+    
+    def _writer_loop(self):
+        """Background loop that writes queued detection frames to disk"""
+        logger.info("Detection frame writer started")
+        
+        # Keep draining after stop so frames already detected are not lost
+        while self._running or not self._save_queue.empty():
+            try:
+                frame, detections, detected_at = self._save_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._save_detection_frame(frame, detections, detected_at)
+        
+        logger.info("Detection frame writer ended")
+    
+    def _save_detection_frame(self, frame: np.ndarray, detections: List[Dict[str, Any]],
+                              detected_at: Optional[datetime] = None):
         """Save frame with detections to disk"""
         try:
+            detected_at = detected_at or datetime.now()
+            
             # Create timestamped filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]  # milliseconds
+            timestamp = detected_at.strftime("%Y%m%d_%H%M%S_%f")[:-3]  # milliseconds
             filename = f"detection_{timestamp}.jpg"
             filepath = os.path.join(self.detections_dir, filename)
             
@@ -322,7 +400,7 @@ class MotionDetector:
                 cv2.putText(annotated_frame, text, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
             
             # Add timestamp to image
-            timestamp_text = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp_text = detected_at.strftime("%Y-%m-%d %H:%M:%S")
             cv2.putText(annotated_frame, timestamp_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
             
             # Add detection count
@@ -48,9 +48,10 @@ class ServerMotionTracker:
         self.min_area = 500  # Minimum area for valid motion
         self.max_area = 50000  # Maximum area (to filter out full-frame changes)
         
-        # Background subtractor for motion detection
+        # Background subtractor for motion detection; shadow pixels (127) would be
+        # dropped by the binary threshold anyway, so skip the shadow pass
         self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-            detectShadows=True,
+            detectShadows=False,
             varThreshold=16
         )
         
@@ -8,6 +8,7 @@ Serves frames that are periodically captured by the camera service
 
 import logging
 import os
+import time
 from flask import Flask, Response, send_file
 from config.config import Config
 
@@ -23,8 +24,10 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = Config.SECRET_KEY
 
 # Fixed paths for latest frames (must match camera_service.py)
-IR_FRAME_PATH = '/home/mark/ufo-tracker/temp/ir_latest.jpg'
-HQ_FRAME_PATH = '/home/mark/ufo-tracker/temp/hq_latest.jpg'
+# Kept on tmpfs (/dev/shm) so twice-a-second snapshots never touch the SD card
+FRAME_DIR = '/dev/shm/ufo-tracker'
+IR_FRAME_PATH = os.path.join(FRAME_DIR, 'ir_latest.jpg')
+HQ_FRAME_PATH = os.path.join(FRAME_DIR, 'hq_latest.jpg')
 
 @app.route('/ir_frame')
 def ir_frame():
@@ -34,12 +37,18 @@ def ir_frame():
             # Get file modification time for cache control
             mtime = os.path.getmtime(IR_FRAME_PATH)
             
-            response = send_file(
-                IR_FRAME_PATH,
-                mimetype='image/jpeg',
-                as_attachment=False,
-                download_name='ir_frame.jpg'
-            )
+            accel_prefix = Config.NETWORK.get('frame_accel_redirect')
+            if accel_prefix:
+                # Fronting nginx serves the file itself via sendfile(); only headers leave Python
+                response = Response(mimetype='image/jpeg')
+                response.headers['X-Accel-Redirect'] = accel_prefix + os.path.basename(IR_FRAME_PATH)
+            else:
+                response = send_file(
+                    IR_FRAME_PATH,
+                    mimetype='image/jpeg',
+                    as_attachment=False,
+                    download_name='ir_frame.jpg'
+                )
             
             # Add headers for no caching
             response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
@@ -65,12 +74,18 @@ def hq_frame():
             # Get file modification time for cache control
             mtime = os.path.getmtime(HQ_FRAME_PATH)
             
-            response = send_file(
-                HQ_FRAME_PATH,
-                mimetype='image/jpeg',
-                as_attachment=False,
-                download_name='hq_frame.jpg'
-            )
+            accel_prefix = Config.NETWORK.get('frame_accel_redirect')
+            if accel_prefix:
+                # Fronting nginx serves the file itself via sendfile(); only headers leave Python
+                response = Response(mimetype='image/jpeg')
+                response.headers['X-Accel-Redirect'] = accel_prefix + os.path.basename(HQ_FRAME_PATH)
+            else:
+                response = send_file(
+                    HQ_FRAME_PATH,
+                    mimetype='image/jpeg',
+                    as_attachment=False,
+                    download_name='hq_frame.jpg'
+                )
             
             # Add headers for no caching
             response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
@@ -100,14 +115,12 @@ def health_check():
     
     if ir_exists:
         try:
-            import time
             ir_age = time.time() - os.path.getmtime(IR_FRAME_PATH)
         except:
             pass
     
     if hq_exists:
         try:
-            import time
             hq_age = time.time() - os.path.getmtime(HQ_FRAME_PATH)
         except:
             pass
@@ -127,7 +140,7 @@ if __name__ == '__main__':
         logger.info(f"Serving frames from: IR={IR_FRAME_PATH}, HQ={HQ_FRAME_PATH}")
         
         # Ensure temp directory exists
-        os.makedirs('/home/mark/ufo-tracker/temp', exist_ok=True)
+        os.makedirs(FRAME_DIR, exist_ok=True)
         
         # Run Flask app on port 5002 (separate from streaming service on 5001)
         app.run(
@@ -0,0 +1,32 @@
+"""
+UFO Tracker - Gunicorn configuration for the camera streaming service
+Run with: gunicorn -c gunicorn_conf.py camera_service:app
+"""
+
+from config.config import Config
+
+bind = f"{Config.HOST}:5001"
+
+# Single worker - each camera can only be opened by one process
+workers = 1
+
+# Threaded worker: each MJPEG viewer holds one thread. Not gevent - its monkey-patched threading
+# would run the JPEG encode loops as greenlets on one hub and Picamera2's native callback thread
+# would signal gevent Conditions from outside the hub
+worker_class = 'gthread'
+# Both cameras' viewers (max_viewers each) plus headroom for API requests
+threads = Config.STREAMING.get('max_viewers', 10) * 2 + 8
+
+# MJPEG responses never complete, so disable the worker timeout
+timeout = 0
+keepalive = 60
+
+def post_worker_init(worker):
+    """Open the cameras inside the worker process (the __main__ block does not run under gunicorn)"""
+    import camera_service
+    camera_service.initialize_cameras()
+
+def worker_exit(server, worker):
+    """Release the cameras when the worker shuts down"""
+    import camera_service
+    camera_service.cleanup_cameras()
@@ -10,6 +10,7 @@ hardware becomes available.
 import logging
 import threading
 import time
+from functools import lru_cache
 from typing import Tuple, Optional, Dict, Any
 from datetime import datetime
 
@@ -17,6 +18,29 @@ from config.config import Config
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=64)
+def _step_half_delays(steps_abs: int, step_delay: float) -> Tuple[float, ...]:
+    """Half-period delay for each step pulse of a trapezoidal move, cached per (steps, speed)"""
+    # Accelerate/decelerate over the first/last 25% of the move, at most 20 steps each
+    accel_steps = min(steps_abs // 4, 20)
+    decel_steps = min(steps_abs // 4, 20)
+    
+    half_delays = []
+    for step in range(steps_abs):
+        if step < accel_steps:
+            # Acceleration phase - start slow, get faster (2x to 1x delay)
+            delay = step_delay * (2.0 - step / accel_steps)
+        elif step >= steps_abs - decel_steps:
+            # Deceleration phase - slow down (1x to 2x delay)
+            delay = step_delay * (2.0 - (steps_abs - step) / decel_steps)
+        else:
+            # Constant speed phase
+            delay = step_delay
+        half_delays.append(delay / 2)
+    
+    return tuple(half_delays)
+
 class PanTiltController:
     """
     Pan-Tilt mechanism controller (Placeholder implementation)
@@ -702,29 +726,15 @@ class WaveshareHRB8825Controller:
         if steps_abs == 0:
             return
         
-        # Acceleration profile parameters
-        accel_steps = min(steps_abs // 4, 20)  # Accelerate for first 25% or max 20 steps
-        decel_steps = min(steps_abs // 4, 20)  # Decelerate for last 25% or max 20 steps
-        
-        for step in range(steps_abs):
-            # Calculate delay based on acceleration profile
-            if step < accel_steps:
-                # Acceleration phase - start slow, get faster
-                progress = step / accel_steps
-                delay = self.step_delay * (2.0 - progress)  # 2x to 1x delay
-            elif step >= steps_abs - decel_steps:
-                # Deceleration phase - slow down
-                progress = (steps_abs - step) / decel_steps
-                delay = self.step_delay * (2.0 - progress)  # 1x to 2x delay  
-            else:
-                # Constant speed phase
-                delay = self.step_delay
-            
+        # Acceleration profile is precomputed, so the pulse loop only toggles and sleeps
+        output = self.GPIO.output
+        step_pin = motor_pins['step']
+        for half_delay in _step_half_delays(steps_abs, self.step_delay):
             # Generate step pulse
-            self.GPIO.output(motor_pins['step'], True)
-            time.sleep(delay / 2)
-            self.GPIO.output(motor_pins['step'], False)
-            time.sleep(delay / 2)
+            output(step_pin, True)
+            time.sleep(half_delay)
+            output(step_pin, False)
+            time.sleep(half_delay)
     
     def set_position(self, pan: float, tilt: float):
         """Set pan/tilt position in degrees"""
@@ -78,12 +78,17 @@ def initialize_satellite_tracker():
             logger.info(f"Loading {len(tle_data)} satellites...")
             
             # Load satellites with progress tracking
+            from sgp4 import omm
             from sgp4.api import Satrec
             
             for i, sat_data in enumerate(tle_data):
                 try:
-                    # Create satellite record using SGP4
-                    sat = Satrec.twoline2rv(sat_data['line1'], sat_data['line2'])
+                    # Create satellite record using SGP4 (OMM JSON records or TLE lines)
+                    if 'omm' in sat_data:
+                        sat = Satrec()
+                        omm.initialize(sat, sat_data['omm'])
+                    else:
+                        sat = Satrec.twoline2rv(sat_data['line1'], sat_data['line2'])
                     if sat:
                         satellite_tracker.satellites[sat_data['name']] = sat
                         # Store metadata including NORAD ID
@@ -6,6 +6,7 @@ Fetches flight data from local PiAware SkyAware and processes nearby aircraft
 import requests
 import time
 import math
+import numpy as np
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
@@ -13,6 +14,13 @@ import threading
 
 from config.config import Config
 
+# Optional orjson for faster aircraft.json parsing, falls back to requests' json()
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 class ADSBTracker:
@@ -26,6 +34,21 @@ class ADSBTracker:
         self.observer_alt = self.config['observer_location']['altitude_feet']
         self.max_distance = self.config['max_distance_miles']
         
+        # Observer latitude terms used by every haversine pass
+        self._observer_lat_rad = math.radians(self.observer_lat)
+        self._observer_cos_lat = math.cos(self._observer_lat_rad)
+        
+        # Bounding box around the observer (1 degree latitude ~ 69 miles) to cheaply
+        # discard far-away aircraft before any trigonometry
+        lat_margin = self.max_distance / 69.0
+        lon_margin = lat_margin / max(self._observer_cos_lat, 0.01)
+        self._bbox = (self.observer_lat - lat_margin, self.observer_lat + lat_margin,
+                      self.observer_lon - lon_margin, self.observer_lon + lon_margin)
+        
+        # Reuse one keep-alive connection to the feeder instead of reconnecting every poll
+        self._use_orjson = ORJSON_AVAILABLE and self.config.get('json_parser', 'orjson') == 'orjson'
+        self._session = requests.Session() if self.config.get('http_session', True) else None
+        
         self.current_flights = {}
         self.last_update = None
         self._running = False
@@ -97,10 +120,11 @@ class ADSBTracker:
             url = self.config['piaware_url']
             timeout = Config.NETWORK['connection_timeout']
             
-            response = requests.get(url, timeout=timeout)
+            http = self._session or requests
+            response = http.get(url, timeout=timeout)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content) if self._use_orjson else response.json()
             logger.debug(f"Fetched {len(data.get('aircraft', []))} aircraft records")
             return data
             
@@ -116,48 +140,83 @@ class ADSBTracker:
         if not aircraft_data or 'aircraft' not in aircraft_data:
             return []
         
-        processed_flights = []
-        current_time = datetime.now()
+        # Gather positioned aircraft into parallel coordinate arrays so range and
+        # altitude filtering run as one vectorized pass instead of per-aircraft math
+        candidates = []
+        lats = []
+        lons = []
+        altitudes = []
+        min_lat, max_lat, min_lon, max_lon = self._bbox
         
         for aircraft in aircraft_data['aircraft']:
+            # Skip aircraft without position
+            if 'lat' not in aircraft or 'lon' not in aircraft:
+                continue
+            
+            # Get altitude (handle different altitude fields)
+            altitude = None
+            if 'alt_baro' in aircraft:
+                altitude = aircraft['alt_baro']
+            elif 'altitude' in aircraft:
+                altitude = aircraft['altitude']
+            
+            # Skip if no altitude
+            if altitude is None:
+                continue
+            
             try:
-                # Skip aircraft without position
-                if 'lat' not in aircraft or 'lon' not in aircraft:
-                    continue
-                
                 lat = float(aircraft['lat'])
                 lon = float(aircraft['lon'])
-                
-                # Calculate distance
-                distance = self.calculate_distance(
-                    self.observer_lat, self.observer_lon, lat, lon
-                )
-                
-                # Skip aircraft too far away
-                if distance > self.max_distance:
-                    continue
-                
-                # Get altitude (handle different altitude fields)
-                altitude = None
-                if 'alt_baro' in aircraft:
-                    altitude = aircraft['alt_baro']
-                elif 'altitude' in aircraft:
-                    altitude = aircraft['altitude']
-                
-                # Skip if no altitude or outside altitude filter
-                if altitude is None:
-                    continue
-                
-                altitude = float(altitude)
-                if (altitude < self.config['altitude_filter']['min_feet'] or 
-                    altitude > self.config['altitude_filter']['max_feet']):
-                    continue
-                
+                alt_feet = float(altitude)
+            except (ValueError, TypeError) as e:
+                logger.debug(f"Error processing aircraft {aircraft.get('hex', 'unknown')}: {e}")
+                continue
+            
+            # Drop aircraft outside the observer bounding box
+            if not (min_lat <= lat <= max_lat and min_lon <= lon <= max_lon):
+                continue
+            
+            candidates.append(aircraft)
+            lats.append(lat)
+            lons.append(lon)
+            altitudes.append(alt_feet)
+        
+        if not candidates:
+            return []
+        
+        lat_arr = np.array(lats)
+        lon_arr = np.array(lons)
+        alt_arr = np.array(altitudes)
+        
+        # Haversine distance from the observer to every aircraft at once (miles)
+        lat_rad = np.radians(lat_arr)
+        dlat = lat_rad - self._observer_lat_rad
+        dlon = np.radians(lon_arr - self.observer_lon)
+        a = np.sin(dlat / 2) ** 2 + self._observer_cos_lat * np.cos(lat_rad) * np.sin(dlon / 2) ** 2
+        distances = 3959.0 * 2 * np.arcsin(np.sqrt(a))
+        
+        # Skip aircraft too far away or outside the altitude filter
+        altitude_filter = self.config['altitude_filter']
+        keep = ((distances <= self.max_distance) &
+                (alt_arr >= altitude_filter['min_feet']) &
+                (alt_arr <= altitude_filter['max_feet']))
+        
+        processed_flights = []
+        current_time = datetime.now()
+        
+        # Only the few aircraft in range get bearing/elevation and a flight record
+        for i in np.flatnonzero(keep):
+            aircraft = candidates[i]
+            lat = lats[i]
+            lon = lons[i]
+            distance = float(distances[i])
+            
+            try:
                 # Calculate bearing and elevation
                 bearing = self.calculate_bearing(
                     self.observer_lat, self.observer_lon, lat, lon
                 )
-                elevation = self.calculate_elevation_angle(distance, altitude)
+                elevation = self.calculate_elevation_angle(distance, altitudes[i])
                 
                 # Build flight record
                 flight = {
@@ -165,7 +224,7 @@ class ADSBTracker:
                     'flight': aircraft.get('flight', '').strip() or 'N/A',
                     'lat': lat,
                     'lon': lon,
-                    'altitude': altitude,
+                    'altitude': altitudes[i],
                     'distance_miles': round(distance, 2),
                     'bearing_degrees': round(bearing, 1),
                     'elevation_degrees': round(elevation, 1),
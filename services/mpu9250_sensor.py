@@ -48,6 +48,8 @@ import math
 import threading
 import json
 import os
+import struct
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple, List
 import numpy as np
@@ -129,6 +131,9 @@ class MPU9250Sensor:
         self.motion_threshold = self.config['motion_threshold']
         self.vibration_threshold = self.config['vibration_threshold']
         
+        # Read accel/temp/gyro in one 14-byte I2C burst instead of per-register reads
+        self.burst_read = self.config.get('burst_read', True)
+        
         # Threading
         self._running = False
         self._update_thread = None
@@ -136,8 +141,8 @@ class MPU9250Sensor:
         self.last_update = None
         
         # History for motion detection and filtering
-        self.sensor_history = []
         self.max_history = 50
+        self.sensor_history = deque(maxlen=self.max_history)
         
         # Calibration file path
         self.calibration_file = 'config/mpu9250_calibration.json'
@@ -285,8 +290,11 @@ class MPU9250Sensor:
                 gyro_sum = {'x': 0.0, 'y': 0.0, 'z': 0.0}
                 
                 for i in range(samples):
-                    accel_x, accel_y, accel_z = self._read_accel_raw()
-                    gyro_x, gyro_y, gyro_z = self._read_gyro_raw()
+                    if self.burst_read:
+                        (accel_x, accel_y, accel_z), (gyro_x, gyro_y, gyro_z), _ = self._read_motion_raw()
+                    else:
+                        accel_x, accel_y, accel_z = self._read_accel_raw()
+                        gyro_x, gyro_y, gyro_z = self._read_gyro_raw()
                     
                     accel_sum['x'] += accel_x
                     accel_sum['y'] += accel_y
@@ -571,10 +579,13 @@ class MPU9250Sensor:
                 
             else:
                 # Read using direct I2C access
-                accel_x, accel_y, accel_z = self._read_accel_raw()
-                gyro_x, gyro_y, gyro_z = self._read_gyro_raw()
+                if self.burst_read:
+                    (accel_x, accel_y, accel_z), (gyro_x, gyro_y, gyro_z), temperature = self._read_motion_raw()
+                else:
+                    accel_x, accel_y, accel_z = self._read_accel_raw()
+                    gyro_x, gyro_y, gyro_z = self._read_gyro_raw()
+                    temperature = self._read_temperature_raw()
                 mag_x, mag_y, mag_z = self._read_mag_raw()
-                temperature = self._read_temperature_raw()
             
             # Apply calibration to magnetometer
             mag_x_cal = (mag_x - self.calibration['mag_offset']['x']) * self.calibration['mag_scale']['x']
@@ -764,20 +775,22 @@ class MPU9250Sensor:
     def _update_history(self):
         """Update sensor history for trend analysis"""
         current_time = time.time()
+        accel = self.current_data['acceleration']
+        gyro = self.current_data['gyroscope']
         
         history_entry = {
             'timestamp': current_time,
             'acceleration': self.current_data['acceleration'].copy(),
             'gyroscope': self.current_data['gyroscope'].copy(),
             'magnetometer': self.current_data['magnetometer'].copy(),
-            'compass_heading': self.current_data['compass']['heading']
+            'compass_heading': self.current_data['compass']['heading'],
+            # Magnitudes computed once per sample so summaries don't recompute them
+            'accel_magnitude': math.sqrt(accel['x']**2 + accel['y']**2 + accel['z']**2),
+            'gyro_magnitude': math.sqrt(gyro['x']**2 + gyro['y']**2 + gyro['z']**2)
         }
         
+        # Bounded deque drops the oldest entry automatically
         self.sensor_history.append(history_entry)
-        
-        # Trim history to max size
-        if len(self.sensor_history) > self.max_history:
-            self.sensor_history.pop(0)
     
     def get_compass_data(self) -> Dict:
         """Get compass-specific data"""
@@ -890,21 +903,11 @@ class MPU9250Sensor:
             }
         
         # Calculate averages and maximums from recent readings
-        recent_entries = self.sensor_history[-10:]  # Last 10 readings
+        recent_entries = list(self.sensor_history)[-10:]  # Last 10 readings
         
-        # Extract acceleration magnitudes
-        recent_accels = []
-        recent_gyros = []
-        
-        for entry in recent_entries:
-            accel = entry['acceleration']
-            gyro = entry['gyroscope']
-            
-            accel_mag = math.sqrt(accel['x']**2 + accel['y']**2 + accel['z']**2)
-            gyro_mag = math.sqrt(gyro['x']**2 + gyro['y']**2 + gyro['z']**2)
-            
-            recent_accels.append(accel_mag)
-            recent_gyros.append(gyro_mag)
+        # Acceleration and angular velocity magnitudes stored with each entry
+        recent_accels = [entry['accel_magnitude'] for entry in recent_entries]
+        recent_gyros = [entry['gyro_magnitude'] for entry in recent_entries]
         
         if not recent_accels:
             return {
@@ -957,6 +960,23 @@ class MPU9250Sensor:
         
         return value
     
+    def _read_motion_raw(self) -> Tuple[Tuple[float, float, float], Tuple[float, float, float], float]:
+        """Burst-read accelerometer, temperature and gyroscope registers (0x3B-0x48) in one transaction"""
+        if not self.mpu:
+            # No fake 0 g sample - let the caller's error handling log and skip this reading
+            raise RuntimeError("MPU9250 I2C bus not initialized")
+        
+        block = self.mpu.read_i2c_block_data(0x68, 0x3B, 14)
+        accel_x_raw, accel_y_raw, accel_z_raw, temp_raw, gyro_x_raw, gyro_y_raw, gyro_z_raw = \
+            struct.unpack('>7h', bytes(block))
+        
+        # Same scaling as the per-register readers (±4g, ±500°/s)
+        accel_scale = 4.0 * 9.81 / 32768.0
+        gyro_scale = 500.0 / 32768.0
+        return ((accel_x_raw * accel_scale, accel_y_raw * accel_scale, accel_z_raw * accel_scale),
+                (gyro_x_raw * gyro_scale, gyro_y_raw * gyro_scale, gyro_z_raw * gyro_scale),
+                (temp_raw / 333.87) + 21.0)
+    
     def _read_accel_raw(self) -> Tuple[float, float, float]:
         """Read raw accelerometer data"""
         accel_x_raw = self._read_raw_data(0x68, 0x3B)
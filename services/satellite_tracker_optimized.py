@@ -6,16 +6,18 @@ Tracks satellites with pre-calculated paths and proximity filtering
 import requests
 import numpy as np
 import time
-import math
 import os
+import json
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import List, Tuple, Dict, Optional, Set
 import threading
 from collections import deque
+from functools import lru_cache
 import heapq
 
-from sgp4.api import Satrec
+from sgp4 import omm
+from sgp4.api import Satrec, SatrecArray
 from sgp4.earth_gravity import wgs84
 from math import degrees, radians, sin, cos, sqrt, atan2, asin
 
@@ -23,6 +25,37 @@ from config.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Name keyword -> category rank; lower ranks win when a name matches several categories
+_CATEGORY_NAMES = ('Space Station', 'Communications', 'Earth Observation', 'Navigation', 'Weather', 'Science')
+_CATEGORY_KEYWORDS = {
+    'ISS': 0, 'TIANHE': 0, 'TIANGONG': 0, 'CSS': 0,
+    'STARLINK': 1, 'ONEWEB': 1, 'IRIDIUM': 1,
+    'LANDSAT': 2, 'SENTINEL': 2, 'SPOT': 2,
+    'GPS': 3, 'GLONASS': 3, 'GALILEO': 3, 'BEIDOU': 3,
+    'WEATHER': 4, 'GOES': 4, 'NOAA': 4,
+    'HUBBLE': 5, 'KEPLER': 5, 'TESS': 5
+}
+
+# Load order priority for satellites of interest (default 5)
+_PRIORITY_KEYWORDS = {
+    'ISS': 1, 'TIANGONG': 1, 'TIANHE': 1,
+    'STARLINK': 2, 'IRIDIUM': 2,
+    'ONEWEB': 3,
+    'GPS': 4, 'GLONASS': 4, 'GALILEO': 4, 'BEIDOU': 4
+}
+
+@lru_cache(maxsize=4096)
+def _categorize(name_upper: str) -> str:
+    """Category for an upper-cased satellite name (cached - names repeat every cache refresh)"""
+    # Plain substring tests so overlapping keywords are all seen
+    rank = min((rank for keyword, rank in _CATEGORY_KEYWORDS.items() if keyword in name_upper), default=None)
+    return _CATEGORY_NAMES[rank] if rank is not None else 'Other'
+
+@lru_cache(maxsize=4096)
+def _load_priority(name_upper: str) -> int:
+    """Load order priority for an upper-cased satellite name"""
+    return min((priority for keyword, priority in _PRIORITY_KEYWORDS.items() if keyword in name_upper), default=5)
+
 
 class OptimizedSatelliteTracker:
     """Optimized satellite tracker with pre-calculation and efficient filtering"""
@@ -33,6 +66,16 @@ class OptimizedSatelliteTracker:
         self.observer_lat = self.config['observer_location']['latitude']
         self.observer_lon = self.config['observer_location']['longitude'] 
         self.observer_alt_km = self.config['observer_location']['altitude_km']
+        
+        # Observer trig terms and ECEF position (km) are fixed, so compute them once
+        lat_rad = radians(self.observer_lat)
+        lon_rad = radians(self.observer_lon)
+        self._sin_lat, self._cos_lat = sin(lat_rad), cos(lat_rad)
+        self._sin_lon, self._cos_lon = sin(lon_rad), cos(lon_rad)
+        obs_radius = 6378.137 + self.observer_alt_km
+        self._observer_ecef = (obs_radius * self._cos_lat * self._cos_lon,
+                               obs_radius * self._cos_lat * self._sin_lon,
+                               obs_radius * self._sin_lat)
         self.min_elevation = self.config['min_elevation']
         
         # Core satellite data
@@ -42,9 +85,9 @@ class OptimizedSatelliteTracker:
         self.visible_satellites = {}  # Currently visible satellites
         
         # Performance optimization
-        self.batch_size = 50  # Process satellites in batches
         self.cache_duration = 300  # Cache predictions for 5 minutes
         self.max_prediction_points = 20  # Points to pre-calculate per satellite
+        self.coalesce_window = 0.25  # Run scheduled jobs due within this many seconds together
         
         # State management
         self.last_update = None
@@ -53,7 +96,8 @@ class OptimizedSatelliteTracker:
         self.last_api_request = None  # Track last API request for rate limiting
         self._running = False
         self._update_thread = None
-        self._cache_thread = None
+        # Set to stop the scheduler thread; also wakes it from its wait immediately
+        self._stop_event = threading.Event()
         self._lock = threading.Lock()
         self._cache_lock = threading.Lock()
         
@@ -71,7 +115,11 @@ class OptimizedSatelliteTracker:
         if tle_url is None:
             tle_url = self.config['tle_url']
         
-        cache_file = self.config.get('tle_cache_file', 'cache/tle/active_satellites.tle')
+        # 'json' (CelesTrak OMM records) or 'tle' (three-line text) - must match the URL's FORMAT
+        tle_format = self.config.get('tle_format', 'tle')
+        cache_file = self.config.get('tle_cache_file', f'cache/tle/active_satellites.{tle_format}')
+        # Validators from the last download, used to make refreshes conditional
+        meta_file = cache_file + '.meta'
         cache_hours = self.config.get('tle_cache_hours', 3)
         
         # Create cache directory if it doesn't exist
@@ -95,7 +143,7 @@ class OptimizedSatelliteTracker:
             try:
                 with open(cache_file, 'r') as f:
                     content = f.read()
-                return self._parse_tle_content(content)
+                return self._parse_content(content, tle_format)
             except Exception as e:
                 logger.warning(f"Error reading cache file, will fetch from API: {e}")
         
@@ -117,18 +165,45 @@ class OptimizedSatelliteTracker:
             headers = {
                 'User-Agent': 'UFO-Tracker/1.0 (contact: your-email@example.com)'  # Identify the application
             }
+            headers.update(self.config.get('tle_request_headers', {}))
+            
+            # Conditional request - CelesTrak only regenerates a few times a day
+            if os.path.exists(cache_file) and os.path.exists(meta_file):
+                try:
+                    with open(meta_file, 'r') as f:
+                        validators = json.load(f)
+                    if validators.get('etag'):
+                        headers['If-None-Match'] = validators['etag']
+                    if validators.get('last_modified'):
+                        headers['If-Modified-Since'] = validators['last_modified']
+                except Exception as e:
+                    logger.debug(f"Ignoring unreadable TLE cache metadata: {e}")
             
             self.last_api_request = time.time()  # Record API request time
             response = requests.get(tle_url, timeout=timeout, headers=headers)
+            
+            if response.status_code == 304:
+                # Unchanged upstream - mark the cache fresh again and reuse it
+                os.utime(cache_file)
+                logger.info("TLE data not modified since last download, using cached copy")
+                with open(cache_file, 'r') as f:
+                    content = f.read()
+                return self._parse_content(content, tle_format)
+            
             response.raise_for_status()
             
             # Save to cache file
             with open(cache_file, 'w') as f:
                 f.write(response.text)
+            with open(meta_file, 'w') as f:
+                json.dump({
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                }, f)
             
             logger.info(f"Successfully cached TLE data to {cache_file}")
             
-            return self._parse_tle_content(response.text)
+            return self._parse_content(response.text, tle_format)
             
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 403:
@@ -138,7 +213,7 @@ class OptimizedSatelliteTracker:
                     logger.info("Using stale cached data due to API block")
                     with open(cache_file, 'r') as f:
                         content = f.read()
-                    return self._parse_tle_content(content)
+                    return self._parse_content(content, tle_format)
                 else:
                     logger.error("No cached data available and API is blocked")
                     return []
@@ -153,9 +228,39 @@ class OptimizedSatelliteTracker:
                 logger.info("Using cached data as fallback due to fetch error")
                 with open(cache_file, 'r') as f:
                     content = f.read()
-                return self._parse_tle_content(content)
+                return self._parse_content(content, tle_format)
             return []
     
+    def _parse_content(self, content: str, tle_format: str) -> List[Dict]:
+        """
+        Parse downloaded or cached element data in the configured format.
+        """
+        if tle_format == 'json':
+            return self._parse_omm_content(content)
+        return self._parse_tle_content(content)
+    
+    def _parse_omm_content(self, content: str) -> List[Dict]:
+        """
+        Parse CelesTrak OMM JSON records into satellite data structures.
+        Records are kept whole and handed to sgp4's OMM initializer, so no TLE line tokenizing is needed.
+        """
+        satellites = []
+        
+        for fields in json.loads(content):
+            try:
+                norad_id = int(fields['NORAD_CAT_ID'])
+            except (KeyError, TypeError, ValueError):
+                norad_id = None
+            
+            satellites.append({
+                'name': str(fields.get('OBJECT_NAME', '')).strip(),
+                'omm': fields,
+                'norad_id': norad_id
+            })
+        
+        logger.info(f"Parsed {len(satellites)} satellites from OMM JSON data")
+        return satellites
+    
     def _parse_tle_content(self, content: str) -> List[Dict]:
         """
         Parse TLE content into satellite data structures.
@@ -226,12 +331,7 @@ class OptimizedSatelliteTracker:
             sat_z_ecef = pos_teme[2]
             
             # Observer position in ECEF
-            lat_rad = radians(self.observer_lat)
-            lon_rad = radians(self.observer_lon)
-            
-            obs_x = (earth_radius + self.observer_alt_km) * cos(lat_rad) * cos(lon_rad)
-            obs_y = (earth_radius + self.observer_alt_km) * cos(lat_rad) * sin(lon_rad)
-            obs_z = (earth_radius + self.observer_alt_km) * sin(lat_rad)
+            obs_x, obs_y, obs_z = self._observer_ecef
             
             # Distance from observer to satellite in ECEF
             dx = sat_x_ecef - obs_x
@@ -262,29 +362,8 @@ class OptimizedSatelliteTracker:
             logger.error("No TLE data fetched")
             return
         
-        # Priority categories for loading
-        priority_keywords = {
-            'ISS': 1,
-            'TIANGONG': 1,
-            'TIANHE': 1,
-            'STARLINK': 2,
-            'IRIDIUM': 2,
-            'ONEWEB': 3,
-            'GPS': 4,
-            'GLONASS': 4,
-            'GALILEO': 4,
-            'BEIDOU': 4
-        }
-        
         # Sort satellites by priority
-        def get_priority(sat_data):
-            name_upper = sat_data['name'].upper()
-            for keyword, priority in priority_keywords.items():
-                if keyword in name_upper:
-                    return priority
-            return 5  # Default priority
-        
-        tle_data.sort(key=get_priority)
+        tle_data.sort(key=lambda sat_data: _load_priority(sat_data['name'].upper()))
         
         satellites = {}
         count = 0
@@ -301,7 +380,11 @@ class OptimizedSatelliteTracker:
                 
             try:
                 # Create SGP4 satellite object
-                satellite = Satrec.twoline2rv(sat_data['line1'], sat_data['line2'])
+                if 'omm' in sat_data:
+                    satellite = Satrec()
+                    omm.initialize(satellite, sat_data['omm'])
+                else:
+                    satellite = Satrec.twoline2rv(sat_data['line1'], sat_data['line2'])
                 
                 # Quick visibility check
                 if self.quick_visibility_check(satellite, jd, fr):
@@ -327,63 +410,6 @@ class OptimizedSatelliteTracker:
         
         logger.info(f"Loaded {count} satellites (filtered from {len(tle_data)} total)")
     
-    def pre_calculate_path(self, name: str, satellite: Satrec, 
-                          start_time: datetime, duration_minutes: int = 5) -> Dict:
-        """
-        Pre-calculate satellite path for the next few minutes.
-        """
-        logger.debug(f"Starting path calculation for {name}")
-        path_points = []
-        time_step = duration_minutes * 60 / self.max_prediction_points  # seconds
-        
-        for i in range(self.max_prediction_points):
-            calc_time = start_time + timedelta(seconds=i * time_step)
-            jd = calc_time.timestamp() / 86400.0 + 2440587.5
-            fr = 0.0
-            
-            try:
-                error, pos_teme, vel_teme = satellite.sgp4(jd, fr)
-                if error == 0:
-                    azimuth, elevation, range_km = self.calculate_look_angles(pos_teme, calc_time)
-                    
-                    # Calculate velocity magnitude in km/s
-                    velocity_kms = sqrt(vel_teme[0]**2 + vel_teme[1]**2 + vel_teme[2]**2)
-                    # Convert to mph (1 km/s = 2236.94 mph)
-                    velocity_mph = velocity_kms * 2236.94
-                    
-                    # Check for NaN or infinite values
-                    if not (math.isfinite(azimuth) and math.isfinite(elevation) and math.isfinite(range_km)):
-                        logger.warning(f"Invalid coordinates for {name}: az={azimuth}, el={elevation}, range={range_km}")
-                        continue
-                    
-                    path_points.append({
-                        'time': calc_time.isoformat(),
-                        'azimuth': round(azimuth, 1),
-                        'elevation': round(elevation, 1),
-                        'range_km': round(range_km, 1),
-                        'velocity_mph': round(velocity_mph, 0),
-                        'visible': elevation >= self.min_elevation
-                    })
-            except Exception as e:
-                logger.debug(f"Error calculating position for {name} at step {i}: {e}")
-                continue
-        
-        # Determine if satellite will be visible in the time window
-        any_visible = any(p['visible'] for p in path_points) if path_points else False
-        max_elevation = max((p['elevation'] for p in path_points), default=-90) if path_points else -90
-        
-        logger.debug(f"Completed path calculation for {name}: {len(path_points)} points, visible: {any_visible}")
-        
-        return {
-            'name': name,
-            'path': path_points,
-            'will_be_visible': any_visible,
-            'max_elevation': max_elevation,
-            'calculated_at': datetime.now().isoformat(),
-            'category': self.get_satellite_category(name),
-            'norad_id': self.satellite_metadata.get(name, {}).get('norad_id')
-        }
-    
     def calculate_look_angles(self, sat_pos_teme: Tuple[float, float, float], 
                             obs_time: datetime) -> Tuple[float, float, float]:
         """
@@ -412,21 +438,9 @@ class OptimizedSatelliteTracker:
         sat_z_ecef = sat_pos_teme[2]  # Z component unchanged
         
         # Observer position in ECEF coordinates
-        lat_rad = radians(self.observer_lat)
-        lon_rad = radians(self.observer_lon)
-        
-        # Earth radius in km (WGS84)
-        earth_radius = 6378.137
-        
-        # Observer position in ECEF
-        cos_lat = cos(lat_rad)
-        sin_lat = sin(lat_rad)
-        cos_lon = cos(lon_rad)
-        sin_lon = sin(lon_rad)
-        
-        obs_x_ecef = (earth_radius + self.observer_alt_km) * cos_lat * cos_lon
-        obs_y_ecef = (earth_radius + self.observer_alt_km) * cos_lat * sin_lon
-        obs_z_ecef = (earth_radius + self.observer_alt_km) * sin_lat
+        cos_lat, sin_lat = self._cos_lat, self._sin_lat
+        cos_lon, sin_lon = self._cos_lon, self._sin_lon
+        obs_x_ecef, obs_y_ecef, obs_z_ecef = self._observer_ecef
         
         # Vector from observer to satellite in ECEF
         dx = sat_x_ecef - obs_x_ecef
@@ -454,26 +468,87 @@ class OptimizedSatelliteTracker:
         
         return azimuth_deg, elevation_deg, range_km
     
+    def calculate_paths(self, names: List[str], satellites: List[Satrec],
+                        start_time: datetime, duration_minutes: int = 5) -> Dict[str, Dict]:
+        """
+        Pre-calculate paths for many satellites at once.
+        All satellites and time steps are propagated in one SatrecArray call and look angles
+        are computed over the resulting arrays; only satellites that will be visible are returned.
+        """
+        if not satellites:
+            return {}
+        
+        time_step = duration_minutes * 60 / self.max_prediction_points  # seconds
+        calc_times = [start_time + timedelta(seconds=i * time_step) for i in range(self.max_prediction_points)]
+        jd = np.array([t.timestamp() / 86400.0 + 2440587.5 for t in calc_times])
+        fr = np.zeros_like(jd)
+        
+        # errors: (N, T), positions/velocities: (N, T, 3) in TEME km and km/s
+        errors, pos_teme, vel_teme = SatrecArray(satellites).sgp4(jd, fr)
+        
+        # TEME to ECEF rotation by Greenwich Mean Sidereal Time, one angle per time step
+        T = (jd - 2451545.0) / 36525.0
+        gmst_rad = np.radians((280.46061837 + 360.98564736629 * (jd - 2451545.0) +
+                               T * T * (0.000387933 - T / 38710000.0)) % 360.0)
+        cos_gmst = np.cos(gmst_rad)
+        sin_gmst = np.sin(gmst_rad)
+        sat_x_ecef = cos_gmst * pos_teme[..., 0] + sin_gmst * pos_teme[..., 1]
+        sat_y_ecef = -sin_gmst * pos_teme[..., 0] + cos_gmst * pos_teme[..., 1]
+        sat_z_ecef = pos_teme[..., 2]
+        
+        # Observer position in ECEF
+        cos_lat, sin_lat = self._cos_lat, self._sin_lat
+        cos_lon, sin_lon = self._cos_lon, self._sin_lon
+        obs_x, obs_y, obs_z = self._observer_ecef
+        
+        dx = sat_x_ecef - obs_x
+        dy = sat_y_ecef - obs_y
+        dz = sat_z_ecef - obs_z
+        
+        # Topocentric SEZ (South, East, Zenith), as in calculate_look_angles
+        with np.errstate(invalid='ignore', divide='ignore'):
+            range_km = np.sqrt(dx * dx + dy * dy + dz * dz)
+            south = -sin_lat * cos_lon * dx - sin_lat * sin_lon * dy + cos_lat * dz
+            east = -sin_lon * dx + cos_lon * dy
+            up = cos_lat * cos_lon * dx + cos_lat * sin_lon * dy + sin_lat * dz
+            elevation = np.degrees(np.arcsin(up / range_km))
+            azimuth = np.degrees(np.arctan2(east, south)) % 360.0
+            velocity_mph = np.sqrt((vel_teme * vel_teme).sum(axis=-1)) * 2236.94
+        
+        valid = (errors == 0) & np.isfinite(azimuth) & np.isfinite(elevation) & np.isfinite(range_km)
+        visible = valid & (elevation >= self.min_elevation)
+        
+        paths = {}
+        time_strings = [t.isoformat() for t in calc_times]
+        calculated_at = datetime.now().isoformat()
+        
+        # Only satellites with at least one visible point need path records
+        for n in np.flatnonzero(visible.any(axis=1)):
+            name = names[n]
+            path_points = [{
+                'time': time_strings[i],
+                'azimuth': round(float(azimuth[n, i]), 1),
+                'elevation': round(float(elevation[n, i]), 1),
+                'range_km': round(float(range_km[n, i]), 1),
+                'velocity_mph': round(float(velocity_mph[n, i]), 0),
+                'visible': bool(visible[n, i])
+            } for i in np.flatnonzero(valid[n])]
+            
+            paths[name] = {
+                'name': name,
+                'path': path_points,
+                'will_be_visible': True,
+                'max_elevation': max(p['elevation'] for p in path_points),
+                'calculated_at': calculated_at,
+                'category': self.get_satellite_category(name),
+                'norad_id': self.satellite_metadata.get(name, {}).get('norad_id')
+            }
+        
+        return paths
+    
     def get_satellite_category(self, sat_name: str) -> str:
         """Categorize satellite by name patterns"""
-        name_upper = sat_name.upper()
-        
-        if 'ISS' in name_upper:
-            return 'Space Station'
-        elif any(keyword in name_upper for keyword in ['TIANHE', 'TIANGONG', 'CSS']):
-            return 'Space Station'
-        elif any(keyword in name_upper for keyword in ['STARLINK', 'ONEWEB', 'IRIDIUM']):
-            return 'Communications'
-        elif any(keyword in name_upper for keyword in ['LANDSAT', 'SENTINEL', 'SPOT']):
-            return 'Earth Observation'
-        elif any(keyword in name_upper for keyword in ['GPS', 'GLONASS', 'GALILEO', 'BEIDOU']):
-            return 'Navigation'
-        elif any(keyword in name_upper for keyword in ['WEATHER', 'GOES', 'NOAA']):
-            return 'Weather'
-        elif any(keyword in name_upper for keyword in ['HUBBLE', 'KEPLER', 'TESS']):
-            return 'Science'
-        else:
-            return 'Other'
+        return _categorize(sat_name.upper())
     
     def refresh_cache(self):
         """
@@ -490,38 +565,15 @@ class OptimizedSatelliteTracker:
             logger.info(f"Got {len(satellites_to_process)} satellites from lock")
         logger.info("Lock released")
         
-        logger.info(f"Processing {len(satellites_to_process)} satellites in batches of {self.batch_size}")
-        
-        new_cache = {}
-        visible_count = 0
-        processed_count = 0
-        
-        # Process in batches for better performance
-        for i in range(0, len(satellites_to_process), self.batch_size):
-            batch = satellites_to_process[i:i + self.batch_size]
-            current_time = datetime.now(timezone.utc)
-            
-            logger.info(f"Processing batch {i//self.batch_size + 1}: satellites {i+1} to {min(i+len(batch), len(satellites_to_process))}")
-            
-            for name, satellite in batch:
-                try:
-                    logger.debug(f"Processing satellite: {name}")
-                    cache_entry = self.pre_calculate_path(name, satellite, current_time)
-                    
-                    if cache_entry['will_be_visible']:
-                        new_cache[name] = cache_entry
-                        visible_count += 1
-                        
-                    processed_count += 1
-                    
-                except Exception as e:
-                    logger.warning(f"Error caching satellite {name}: {e}")
-                    processed_count += 1
-            
-            logger.info(f"Batch complete. Processed: {processed_count}/{len(satellites_to_process)}, Visible: {visible_count}")
-            
-            # Yield to other threads
-            time.sleep(0.01)
+        # Propagate every satellite for the whole prediction window in one vectorized pass
+        names = [name for name, _ in satellites_to_process]
+        try:
+            new_cache = self.calculate_paths(names, [sat for _, sat in satellites_to_process],
+                                             datetime.now(timezone.utc))
+        except Exception as e:
+            logger.warning(f"Error calculating satellite paths: {e}")
+            new_cache = {}
+        visible_count = len(new_cache)
         
         # Update cache atomically
         with self._cache_lock:
@@ -598,58 +650,65 @@ class OptimizedSatelliteTracker:
         max_count = self.config['display_settings']['max_display_count']
         return overhead_satellites[:max_count]
     
-    def _cache_refresh_loop(self):
-        """Background thread for cache refresh"""
-        logger.info("Cache refresh loop started")
+    def _update_visible_satellites(self):
+        """Refresh TLEs when due and publish the currently visible satellites from the cache"""
+        # Check if we need to refresh TLE data
+        if (self.last_tle_fetch is None or 
+            datetime.now() - self.last_tle_fetch > timedelta(hours=self.config['tle_refresh_hours'])):
+            logger.info("Refreshing TLE data")
+            self.load_satellites()
+            # Force cache refresh after loading new TLEs
+            self.refresh_cache()
         
-        while self._running:
-            try:
-                self.refresh_cache()
-                
-                # Wait before next refresh
-                time.sleep(self.cache_duration)
-                
-            except Exception as e:
-                logger.error(f"Error in cache refresh loop: {e}")
-                time.sleep(60)
+        # Get current overhead satellites from cache
+        overhead_satellites = self.get_overhead_satellites()
         
-        logger.info("Cache refresh loop ended")
+        with self._lock:
+            self.visible_satellites = {
+                sat['name']: sat for sat in overhead_satellites
+            }
+            self.last_update = datetime.now()
+            self.satellites_processed = len(self.satellite_cache)
+        
+        logger.info(f"Updated: {len(overhead_satellites)} visible satellites "
+                   f"from {self.satellites_processed} cached")
     
-    def _update_loop(self):
-        """Main update loop for updating visible satellites"""
-        logger.info("Satellite update loop started")
+    def _scheduler_loop(self):
+        """
+        Single background thread running both the visible-satellite update and the cache refresh.
+        Jobs sit in a min-heap by due time; jobs falling due within the coalescing window share one wake-up.
+        """
+        logger.info("Satellite scheduler loop started")
         
-        while self._running:
-            try:
-                # Check if we need to refresh TLE data
-                if (self.last_tle_fetch is None or 
-                    datetime.now() - self.last_tle_fetch > timedelta(hours=self.config['tle_refresh_hours'])):
-                    logger.info("Refreshing TLE data")
-                    self.load_satellites()
-                    # Force cache refresh after loading new TLEs
-                    self.refresh_cache()
-                
-                # Get current overhead satellites from cache
-                overhead_satellites = self.get_overhead_satellites()
-                
-                with self._lock:
-                    self.visible_satellites = {
-                        sat['name']: sat for sat in overhead_satellites
-                    }
-                    self.last_update = datetime.now()
-                    self.satellites_processed = len(self.satellite_cache)
-                
-                logger.info(f"Updated: {len(overhead_satellites)} visible satellites "
-                           f"from {self.satellites_processed} cached")
-                
-                # Wait for next update
-                time.sleep(self.config['update_interval'])
-                
-            except Exception as e:
-                logger.error(f"Error in satellite update loop: {e}")
-                time.sleep(30)
+        # name -> (interval seconds, job, retry delay after an error)
+        jobs = {
+            'update': (self.config['update_interval'], self._update_visible_satellites, 30),
+            'cache': (self.cache_duration, self.refresh_cache, 60)
+        }
+        now = time.monotonic()
+        # The cache was populated by start(), so its first refresh is a full interval away
+        schedule = [(now, 'update'), (now + self.cache_duration, 'cache')]
+        heapq.heapify(schedule)
+        
+        while not self._stop_event.is_set():
+            wait_time = schedule[0][0] - time.monotonic()
+            if wait_time > 0 and self._stop_event.wait(wait_time):
+                break
+            
+            # Run every job due now or within the coalescing window
+            horizon = time.monotonic() + self.coalesce_window
+            while schedule and schedule[0][0] <= horizon:
+                _, name = heapq.heappop(schedule)
+                interval, job, retry_delay = jobs[name]
+                try:
+                    job()
+                    next_run = interval
+                except Exception as e:
+                    logger.error(f"Error in satellite {name} job: {e}")
+                    next_run = retry_delay
+                heapq.heappush(schedule, (time.monotonic() + next_run, name))
         
-        logger.info("Satellite update loop ended")
+        logger.info("Satellite scheduler loop ended")
     
     def start(self):
         """Start satellite tracking"""
@@ -673,12 +732,9 @@ class OptimizedSatelliteTracker:
             # Initial cache population
             self.refresh_cache()
             
-            # Start cache refresh thread
-            self._cache_thread = threading.Thread(target=self._cache_refresh_loop, daemon=True)
-            self._cache_thread.start()
-            
-            # Start update thread
-            self._update_thread = threading.Thread(target=self._update_loop, daemon=True)
+            # Start the scheduler thread that runs updates and cache refreshes
+            self._stop_event.clear()
+            self._update_thread = threading.Thread(target=self._scheduler_loop, daemon=True)
             self._update_thread.start()
             
             logger.info("Optimized satellite tracker started successfully")
@@ -697,11 +753,11 @@ class OptimizedSatelliteTracker:
                 return
             
             self._running = False
+            self._stop_event.set()
             
-            # Wait for threads to finish
-            for thread in [self._update_thread, self._cache_thread]:
-                if thread and thread.is_alive():
-                    thread.join(timeout=2.0)
+            # Wait for the scheduler thread to finish
+            if self._update_thread and self._update_thread.is_alive():
+                self._update_thread.join(timeout=2.0)
             
             logger.info("Optimized satellite tracker stopped")
     